@@ -0,0 +1,54 @@
+"""Benchmark the headless Dino simulator.
+
+Plays games with a fixed jump policy on DinoWorld without a window, first on
+one core and then spread over a process pool, and reports simulated frames
+per second per core and in total.
+
+Usage:
+    python bench_dino_sim.py --frames 2000000 --workers 8
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from dino_evolve import run_episode
+
+# Jumps when the next obstacle is within about 100 pixels
+BENCH_POLICY = [-8.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+def simulate(frames, seed, max_frames=20000):
+    # Runs whole games until at least `frames` frames have been simulated
+    done = 0
+    while done < frames:
+        _, survived = run_episode(BENCH_POLICY, seed, min(max_frames, frames - done))
+        done += survived
+        seed += 1
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the headless Dino simulator")
+    parser.add_argument('--frames', type=int, default=2_000_000, help="frames to simulate per run")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    frames = simulate(args.frames // args.workers, 0)
+    single = frames / (time.perf_counter() - start)
+    print(f"1 core:     {single:,.0f} frames/s")
+
+    share = args.frames // args.workers
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Start the workers before timing so pygame's import isn't counted
+        list(pool.map(simulate, [1] * args.workers, range(args.workers)))
+        start = time.perf_counter()
+        frames = sum(pool.map(simulate, [share] * args.workers, [i * 1_000_000 for i in range(args.workers)]))
+        elapsed = time.perf_counter() - start
+    print(f"{args.workers} workers: {frames / elapsed:,.0f} frames/s total, "
+          f"{frames / elapsed / args.workers:,.0f} per core, {frames / elapsed * 60 / 1e6:.1f}M frames/minute")
+
+
+if __name__ == "__main__":
+    main()
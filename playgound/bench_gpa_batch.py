@@ -0,0 +1,52 @@
+"""Benchmark the batch GPA engine.
+
+Writes synthetic per-student transcripts to a temporary directory, summarizes
+them with gpa_batch.run_batch and reports files and rows per second.
+
+Usage:
+    python bench_gpa_batch.py --files 5000 --rows 40 --workers 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from gpa_batch import run_batch
+from gpa_core import Course, FileHandler
+
+COURSE_NAMES = [f"Course {i}" for i in range(300)]
+
+
+def write_transcripts(directory, files, rows, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for i in range(files):
+        path = os.path.join(directory, f"student{i:06d}.csv")
+        FileHandler.save_to_csv(path, [Course(rng.choice(COURSE_NAMES), rng.choice([1, 2, 3, 4]),
+                                              rng.randint(55, 100)) for _ in range(rows)])
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batch GPA engine")
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--rows', type=int, default=40, help="courses per transcript")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_transcripts(directory, args.files, args.rows)
+        start = time.perf_counter()
+        rows = sum(summary['courses'] for summary in run_batch(paths, args.workers, args.batch_size))
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.files} files x {args.rows} rows, {args.workers} workers")
+    print(f"files/s: {args.files / elapsed:,.0f}")
+    print(f"rows/s: {rows / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
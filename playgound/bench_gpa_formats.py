@@ -0,0 +1,56 @@
+"""Benchmark loading course files from CSV against the binary format.
+
+Writes the same synthetic courses as CSV and as .gpab to a temporary
+directory, then times opening each file and computing the GPA, as the app
+does on Load Data.
+
+Usage:
+    python bench_gpa_formats.py --rows 1000000 --repeat 5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from gpa_core import Course, CourseColumns, FileHandler, GPACalculator
+
+COURSE_NAMES = [f"Course {i}" for i in range(300)]
+
+
+def time_load(path, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        calculator = GPACalculator()
+        calculator.set_courses(FileHandler.load_from_csv(path))
+        calculator.calculate_gpa()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV and binary course file loading")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    courses = CourseColumns(Course(rng.choice(COURSE_NAMES), rng.choice([1, 2, 3, 4]), rng.uniform(55, 100))
+                            for _ in range(args.rows))
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'courses.csv')
+        binary_path = os.path.join(directory, 'courses.gpab')
+        FileHandler.save_to_csv(csv_path, courses)
+        FileHandler.save_to_binary(binary_path, courses)
+        csv_time = time_load(csv_path, args.repeat)
+        binary_time = time_load(binary_path, args.repeat)
+        print(f"{args.rows:,} courses")
+        print(f"csv:    {os.path.getsize(csv_path) / 1e6:8.1f} MB, load + GPA {csv_time * 1000:9.1f} ms")
+        print(f"binary: {os.path.getsize(binary_path) / 1e6:8.1f} MB, load + GPA {binary_time * 1000:9.1f} ms")
+        print(f"speed-up: {csv_time / binary_time:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
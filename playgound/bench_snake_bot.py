@@ -0,0 +1,60 @@
+"""Benchmark the Snake pathfinding bot on large grids.
+
+Plays single-player games driven by snake_bot.PathfindingBot without a window
+and reports decisions per second and the average score.
+
+Usage:
+    python bench_snake_bot.py --grid 100 --games 5 --max-ticks 20000
+"""
+import argparse
+import time
+
+import snake
+
+
+def play(grid, max_ticks, seed):
+    game = snake.Game({'snake_color': (0, 255, 0), 'player_count': 0, 'bots': 1,
+                       'grid_width': grid, 'grid_height': grid, 'seed': seed})
+    bot = game.players[0].controller
+    choose = bot.choose_direction
+    decision_time = 0.0
+
+    # Time only the bot's decisions, not the rest of the tick
+    def timed_choose(game, player):
+        nonlocal decision_time
+        start = time.perf_counter()
+        direction = choose(game, player)
+        decision_time += time.perf_counter() - start
+        return direction
+    bot.choose_direction = timed_choose
+
+    while not game.game_over and game.tick < max_ticks:
+        game.update()
+    return game.players[0].score, game.tick, decision_time, bot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Snake pathfinding bot")
+    parser.add_argument('--grid', type=int, default=100, help="grid width and height in cells")
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--max-ticks', type=int, default=20000)
+    args = parser.parse_args()
+
+    total_ticks = 0
+    total_time = 0.0
+    scores = []
+    for seed in range(args.games):
+        score, ticks, decision_time, bot = play(args.grid, args.max_ticks, seed)
+        scores.append(score)
+        total_ticks += ticks
+        total_time += decision_time
+        print(f"game {seed}: score {score}, {ticks} ticks, "
+              f"{bot.full_searches} full searches, {bot.repairs} incremental repairs")
+
+    print(f"{args.grid}x{args.grid} grid, {args.games} games")
+    print(f"decisions/s: {total_ticks / total_time:,.0f}")
+    print(f"average score: {sum(scores) / len(scores):.1f}")
+
+
+if __name__ == "__main__":
+    main()
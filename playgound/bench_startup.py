@@ -0,0 +1,64 @@
+"""Startup-time benchmark for the pygame games.
+
+Each scenario runs in a fresh interpreter so module imports are cold, and is
+timed from the first import to the end of the scenario:
+
+    import pygame        the floor every game pays
+    snake: import        importing the game logic, no window
+    snake: menu          window, fonts and the first main menu frame
+    snake: first frame   window, fonts and the first frame of a game
+    dino: import
+    dino: first frame
+
+Usage:
+    python bench_startup.py --runs 5
+    python bench_startup.py --headless      # SDL dummy video driver, e.g. over SSH
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = [
+    ('import pygame', "import pygame"),
+    ('snake: import', "import snake"),
+    ('snake: menu', "import snake\nsnake.init_display()\nsnake.MainMenu().draw()"),
+    ('snake: first frame', "import snake\nsnake.init_display()\n"
+                           "snake.Game({'snake_color': (0, 255, 0), 'player_count': 1}).render()"),
+    ('dino: import', "import dino_game"),
+    ('dino: first frame', "import dino_game\ndino_game.init_display()\n"
+                          "dino_game.DinoRenderer(dino_game.SCREEN).draw(dino_game.DinoWorld())"),
+]
+
+TIMER = """import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+
+def time_scenario(code, env):
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-c', TIMER.format(code=code)], cwd=here, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import and first-frame times")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--headless', action='store_true', help="use SDL's dummy video driver")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1')
+    if args.headless:
+        env['SDL_VIDEODRIVER'] = 'dummy'
+    for name, code in SCENARIOS:
+        times = [time_scenario(code, env) for _ in range(args.runs)]
+        print(f"{name:<20} median {statistics.median(times) * 1000:8.1f} ms   "
+              f"min {min(times) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Evolve Dino jump policies on the headless DinoWorld simulator.
+
+A policy is a linear threshold unit over DinoWorld.observe(): the dino jumps
+whenever the weighted sum of the features plus a bias is positive. Nothing is
+drawn, so a worker simulates frames as fast as the physics runs. Every
+generation, the whole population is scored on the same fresh seeds across a
+process pool. The best policies carry over unchanged and the rest of the next
+generation are mutated copies of them.
+
+Usage:
+    python dino_evolve.py --generations 30 --population 64 --episodes 4
+    python dino_evolve.py --generations 50 --output best_policy.json
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dino_game import DinoWorld
+
+# One weight per DinoWorld.observe() feature, plus a bias
+POLICY_SIZE = 7
+
+
+def act(policy, features):
+    total = policy[-1]
+    for weight, feature in zip(policy, features):
+        total += weight * feature
+    return total > 0
+
+
+def run_episode(policy, seed, max_frames):
+    # Returns the score and the frames survived, capped at max_frames
+    world = DinoWorld(seed)
+    for frame in range(1, max_frames + 1):
+        if act(policy, world.observe()):
+            world.jump()
+        if world.step():
+            break
+    return world.score, frame
+
+
+def evaluate_batch(batch, seeds, max_frames):
+    # Runs in a worker process; returns (index, mean frames survived, mean
+    # score, frames simulated) for each (index, policy) in the batch
+    results = []
+    for index, policy in batch:
+        episodes = [run_episode(policy, seed, max_frames) for seed in seeds]
+        frames = sum(frames for _, frames in episodes)
+        results.append((index, frames / len(seeds), sum(score for score, _ in episodes) / len(seeds), frames))
+    return results
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def random_policy(rng):
+    return [rng.gauss(0, 1) for _ in range(POLICY_SIZE)]
+
+
+def next_generation(ranked, population_size, elite, sigma, rng):
+    # ranked is the previous population, best first
+    parents = ranked[:elite]
+    children = [list(policy) for policy in parents]
+    while len(children) < population_size:
+        parent = rng.choice(parents)
+        children.append([weight + rng.gauss(0, sigma) for weight in parent])
+    return children
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evolve Dino jump policies")
+    parser.add_argument('--generations', type=int, default=30)
+    parser.add_argument('--population', type=int, default=64)
+    parser.add_argument('--elite', type=int, default=8, help="policies kept unchanged each generation")
+    parser.add_argument('--sigma', type=float, default=0.3, help="standard deviation of weight mutations")
+    parser.add_argument('--episodes', type=int, default=4, help="games per policy per generation")
+    parser.add_argument('--max-frames', type=int, default=20000, help="frames before a game is stopped")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=4, help="policies per worker task")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='PATH', help="write the best policy as JSON")
+    args = parser.parse_args()
+    if not 0 < args.elite <= args.population:
+        parser.error("--elite must be between 1 and --population")
+
+    rng = random.Random(args.seed)
+    population = [random_policy(rng) for _ in range(args.population)]
+    best = None
+    total_frames = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for generation in range(args.generations):
+            # Fresh seeds every generation so policies can't overfit a few games
+            seeds = [rng.getrandbits(32) for _ in range(args.episodes)]
+            futures = [pool.submit(evaluate_batch, batch, seeds, args.max_frames)
+                       for batch in batched(enumerate(population), args.batch_size)]
+            fitness = [0.0] * len(population)
+            scores = [0.0] * len(population)
+            for future in as_completed(futures):
+                for index, frames_survived, score, frames in future.result():
+                    fitness[index] = frames_survived
+                    scores[index] = score
+                    total_frames += frames
+
+            order = sorted(range(len(population)), key=fitness.__getitem__, reverse=True)
+            ranked = [population[i] for i in order]
+            best = {'generation': generation, 'frames': fitness[order[0]], 'score': scores[order[0]],
+                    'policy': ranked[0]}
+            elapsed = time.perf_counter() - start
+            print(f"generation {generation}: best {fitness[order[0]]:.0f} frames (score {scores[order[0]]:.1f}), "
+                  f"mean {sum(fitness) / len(fitness):.0f} frames, {total_frames / elapsed:,.0f} frames/s",
+                  file=sys.stderr)
+            population = next_generation(ranked, args.population, args.elite, args.sigma, rng)
+
+    print(json.dumps(best))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(best, f)
+
+
+if __name__ == "__main__":
+    main()
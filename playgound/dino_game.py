@@ -1,14 +1,12 @@
 import pygame
 import random
-import sys
-
-# Initialize Pygame
-pygame.init()
+import argparse
+import atexit
+from collections import deque
+from frame_profiler import NULL_PROFILER, FrameProfiler
 
 # Screen dimensions
 WIDTH, HEIGHT = 800, 400
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Chrome Dino Game")
 
 # Clock to control the frame rate
 clock = pygame.time.Clock()
@@ -16,38 +14,336 @@ clock = pygame.time.Clock()
 # Define colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
+CLOUD_COLOR = (225, 225, 225)
+PEBBLE_COLOR = (150, 150, 150)
 GROUND_HEIGHT = HEIGHT - 70
 
+# Scrolling background strips: (top, height, speed relative to the obstacles)
+CLOUD_LAYER = (40, 100, 0.2)
+GROUND_LAYER = (GROUND_HEIGHT - 1, 24, 1.0)
+
+# Physics steps per second. Velocities, gravity and spawn gaps below are per
+# 1/60 s and are scaled to the step length, so any step rate plays the same
+BASE_RATE = 60
+SIM_RATE = 60
+FRAME_RATE = 60
+# Most physics steps run in one frame before the game slows down instead
+MAX_CATCH_UP_STEPS = 8
+
 # Dinosaur settings
 dino_width, dino_height = 50, 50
 dino_x = 50
-dino_y = GROUND_HEIGHT - dino_height
-dino_velocity = 0
 gravity = 1
-is_jumping = False
+jump_velocity = -15
 
-# Obstacle settings
-obstacle_width, obstacle_height = 20, 50
-obstacle_x = WIDTH
-obstacle_y = GROUND_HEIGHT - obstacle_height
+# Obstacle settings: (width, height, height above the ground, color) per type
+OBSTACLE_TYPES = {
+    'small_cactus': (20, 50, 0, (200, 0, 0)),
+    'large_cactus': (30, 70, 0, (160, 0, 0)),
+    'cactus_group': (60, 50, 0, (200, 60, 0)),
+    'bird': (40, 30, 25, (90, 90, 90)),
+}
+MAX_OBSTACLES = 16
 obstacle_velocity = 7
+MAX_OBSTACLE_VELOCITY = 14
+# Frames between spawns at the lowest and highest difficulty; the dino is in
+# the air for about 30 frames, so gaps never go below that
+SPAWN_GAP_EASY = (60, 110)
+SPAWN_GAP_HARD = (34, 60)
+# Score at which the scheduler reaches full difficulty
+MAX_DIFFICULTY_SCORE = 60
+
+# Game states
+STATE_PLAYING = 'playing'
+STATE_GAME_OVER = 'game_over'
+STATE_QUIT = 'quit'
+
+
+class ObstaclePool:
+    # All obstacle rects are allocated up front. Spawning reuses a free slot and
+    # obstacles leaving the screen go back to the free list, so the main loop
+    # never allocates. Obstacles share one speed and spawn at the right edge,
+    # so `active` stays sorted by x.
+    def __init__(self, capacity=MAX_OBSTACLES):
+        self.rects = [pygame.Rect(0, 0, 0, 0) for _ in range(capacity)]
+        # Exact positions, and the positions before the last step for drawing
+        # between physics steps; the rects hold them rounded for collisions
+        self.x = [0.0] * capacity
+        self.previous_x = [0.0] * capacity
+        self.colors = [BLACK] * capacity
+        self.draw_rect = pygame.Rect(0, 0, 0, 0)
+        self.active = deque()
+        self.free = list(range(capacity))
+
+    def reset(self):
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def spawn(self, kind, x):
+        if not self.free:
+            return False
+        slot = self.free.pop()
+        width, height, lift, color = OBSTACLE_TYPES[kind]
+        self.rects[slot].update(x, GROUND_HEIGHT - lift - height, width, height)
+        self.x[slot] = self.previous_x[slot] = x
+        self.colors[slot] = color
+        self.active.append(slot)
+        return True
+
+    def move(self, dx):
+        # Moves every obstacle left and culls the ones now off-screen; returns
+        # how many were culled
+        rects, xs, previous_x = self.rects, self.x, self.previous_x
+        for slot in self.active:
+            previous_x[slot] = xs[slot]
+            xs[slot] -= dx
+            rects[slot].x = round(xs[slot])
+        culled = 0
+        while self.active and rects[self.active[0]].right < 0:
+            self.free.append(self.active.popleft())
+            culled += 1
+        return culled
+
+    def collides(self, rect):
+        # Only obstacles overlapping the dino horizontally are tested; the
+        # rest are either behind it or still further right
+        for slot in self.active:
+            obstacle = self.rects[slot]
+            if obstacle.left >= rect.right:
+                return False
+            if obstacle.right > rect.left and obstacle.colliderect(rect):
+                return True
+        return False
+
+    def next_ahead(self, x):
+        # The nearest obstacle whose right edge is still past x, or None
+        for slot in self.active:
+            if self.rects[slot].right > x:
+                return self.rects[slot]
+        return None
+
+    def draw(self, surface, alpha=1.0, drawn=None):
+        # alpha blends from the previous step's positions (0) to the current (1)
+        rect = self.draw_rect
+        for slot in self.active:
+            rect.update(self.rects[slot])
+            rect.x = round(self.previous_x[slot] + (self.x[slot] - self.previous_x[slot]) * alpha)
+            bounds = pygame.draw.rect(surface, self.colors[slot], rect)
+            if drawn is not None:
+                drawn.append(bounds)
+
+
+class SpawnScheduler:
+    # Counts down frames to the next obstacle. As the score rises the gaps
+    # shrink, obstacles speed up and the larger types become more likely.
+    kinds = list(OBSTACLE_TYPES)
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self.countdown = 0
+
+    def reset(self):
+        self.countdown = 0
+
+    @staticmethod
+    def difficulty(current_score):
+        return min(1.0, current_score / MAX_DIFFICULTY_SCORE)
+
+    @staticmethod
+    def speed(current_score):
+        return min(MAX_OBSTACLE_VELOCITY, obstacle_velocity + current_score // 10)
+
+    def update(self, pool, current_score, dt=1.0):
+        self.countdown -= dt
+        if self.countdown > 0:
+            return
+        level = self.difficulty(current_score)
+        weights = (1.0, level, level, max(0.0, level - 0.3))
+        kind = self.rng.choices(self.kinds, weights)[0]
+        pool.spawn(kind, WIDTH)
+        low = round(SPAWN_GAP_EASY[0] + (SPAWN_GAP_HARD[0] - SPAWN_GAP_EASY[0]) * level)
+        high = round(SPAWN_GAP_EASY[1] + (SPAWN_GAP_HARD[1] - SPAWN_GAP_EASY[1]) * level)
+        self.countdown = self.rng.randint(low, high)
+
 
-# Game variables
-score = 0
-font = pygame.font.SysFont(None, 36)
+class DinoWorld:
+    # Everything that changes during a run: the dino, its obstacles and the
+    # score. A restart resets the world in place, and worlds share no state,
+    # so several can run side by side in one process.
+    def __init__(self, seed=None, sim_rate=SIM_RATE):
+        self.rng = random.Random(seed)
+        self.sim_rate = sim_rate
+        self.dt = BASE_RATE / sim_rate
+        self.dino_rect = pygame.Rect(dino_x, GROUND_HEIGHT - dino_height, dino_width, dino_height)
+        self.draw_rect = self.dino_rect.copy()
+        self.obstacles = ObstaclePool()
+        self.scheduler = SpawnScheduler(self.rng)
+        self.reset()
 
-def draw_dino(x, y):
-    pygame.draw.rect(SCREEN, BLACK, (x, y, dino_width, dino_height))
+    def reset(self):
+        self.dino_y = self.previous_dino_y = GROUND_HEIGHT - dino_height
+        self.dino_velocity = 0
+        self.is_jumping = False
+        self.score = 0
+        # How far the ground has scrolled, for the parallax background
+        self.distance = self.previous_distance = 0.0
+        self.obstacles.reset()
+        self.scheduler.reset()
 
-def draw_obstacle(x, y):
-    pygame.draw.rect(SCREEN, (200, 0, 0), (x, y, obstacle_width, obstacle_height))
+    def jump(self):
+        if not self.is_jumping:
+            self.dino_velocity = jump_velocity
+            self.is_jumping = True
 
-def show_score(current_score):
-    score_text = font.render(f"Score: {current_score}", True, BLACK)
-    SCREEN.blit(score_text, (10, 10))
+    def update_physics(self):
+        # Apply gravity. The jump follows the exact parabola of the original
+        # per-frame update (velocity first, then position), so every step rate
+        # traces the same arc and reaches the same apex
+        dt = self.dt
+        self.previous_dino_y = self.dino_y
+        if self.is_jumping:
+            self.dino_y += (self.dino_velocity + gravity / 2) * dt + gravity * dt * dt / 2
+            self.dino_velocity += gravity * dt
+
+            if self.dino_y >= GROUND_HEIGHT - dino_height:
+                self.dino_y = GROUND_HEIGHT - dino_height
+                self.is_jumping = False
+
+        # Move obstacles and spawn new ones
+        self.scheduler.update(self.obstacles, self.score, dt)
+        dx = self.scheduler.speed(self.score) * dt
+        self.previous_distance = self.distance
+        self.distance += dx
+        self.score += self.obstacles.move(dx)  # Increase score when obstacles pass
+
+    def check_collision(self):
+        self.dino_rect.y = round(self.dino_y)
+        return self.obstacles.collides(self.dino_rect)
+
+    def observe(self):
+        # Inputs for a jump policy, all roughly in 0..1: distance to the next
+        # obstacle, its width, height and height above the ground, the current
+        # speed and the dino's height above the ground
+        obstacle = self.obstacles.next_ahead(dino_x)
+        speed = self.scheduler.speed(self.score) / MAX_OBSTACLE_VELOCITY
+        altitude = (GROUND_HEIGHT - dino_height - self.dino_y) / 100
+        if obstacle is None:
+            return (1.0, 0.0, 0.0, 0.0, speed, altitude)
+        return ((obstacle.left - dino_x - dino_width) / WIDTH, obstacle.width / 100, obstacle.height / 100,
+                (GROUND_HEIGHT - obstacle.bottom) / 100, speed, altitude)
+
+    def step(self):
+        # One physics step; returns True if the dino crashed
+        self.update_physics()
+        return self.check_collision()
+
+    def draw(self, surface, alpha=1.0, drawn=None):
+        # Draws the world alpha of the way from the previous physics step to
+        # the current one; the rects drawn are appended to `drawn` if given
+        self.draw_rect.y = round(self.previous_dino_y + (self.dino_y - self.previous_dino_y) * alpha)
+        rect = pygame.draw.rect(surface, BLACK, self.draw_rect)
+        if drawn is not None:
+            drawn.append(rect)
+        self.obstacles.draw(surface, alpha, drawn)
+
+# Swapped for a FrameProfiler by --profile
+profiler = NULL_PROFILER
+
+# The window and fonts are created by init_display() when the game starts, so
+# importing this module opens no window
+SCREEN = None
+font = None
+overlay_font = None
+
+def init_display():
+    global SCREEN, font, overlay_font
+    if SCREEN is None:
+        pygame.init()
+        SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Chrome Dino Game")
+        font = pygame.font.SysFont(None, 36)
+        overlay_font = pygame.font.SysFont(None, 20)
+    return SCREEN
+
+class DinoRenderer:
+    # Draws the game from surfaces rendered once: a static background with the
+    # ground line, and tiles for the scrolling strips. Each frame only the
+    # strips, the areas under the dino and obstacles (last frame's and this
+    # frame's) and the score, when it changes, are redrawn and updated.
+    def __init__(self, surface):
+        self.surface = surface
+        self.background = pygame.Surface(surface.get_size()).convert()
+        self.background.fill(WHITE)
+        pygame.draw.line(self.background, BLACK, (0, GROUND_HEIGHT), (WIDTH, GROUND_HEIGHT), 2)
+        rng = random.Random(0)
+        self.layers = []
+        for (top, height, speed), decorate in ((CLOUD_LAYER, self.draw_clouds), (GROUND_LAYER, self.draw_pebbles)):
+            strip = pygame.Rect(0, top, WIDTH, height)
+            tile = self.background.subsurface(strip).copy()
+            decorate(tile, rng)
+            self.layers.append((tile, strip, speed))
+        self.score = None
+        self.score_rect = pygame.Rect(10, 10, 0, 0)
+        self.drawn = []
+        self.needs_full_redraw = True
+
+    @staticmethod
+    def draw_clouds(tile, rng):
+        # Clouds are kept clear of the tile's side edges so the tile wraps seamlessly
+        for _ in range(5):
+            width = rng.randint(60, 120)
+            cloud = pygame.Rect(rng.randint(0, WIDTH - width), rng.randint(0, tile.get_height() - 30), width, 30)
+            pygame.draw.ellipse(tile, CLOUD_COLOR, cloud)
+
+    @staticmethod
+    def draw_pebbles(tile, rng):
+        for _ in range(40):
+            x = rng.randint(0, WIDTH - 6)
+            y = rng.randint(6, tile.get_height() - 2)
+            pygame.draw.line(tile, PEBBLE_COLOR, (x, y), (x + rng.randint(1, 5), y))
+
+    def draw(self, world, alpha=1.0):
+        surface = self.surface
+        background = self.background
+        if self.needs_full_redraw:
+            surface.blit(background, (0, 0))
+            self.score = None
+
+        # Erase last frame's sprites and overlay, then redraw the strips
+        dirty = self.drawn
+        for rect in dirty:
+            surface.blit(background, rect, rect)
+        distance = world.previous_distance + (world.distance - world.previous_distance) * alpha
+        for tile, strip, speed in self.layers:
+            x = -(round(distance * speed) % WIDTH)
+            surface.blit(tile, (x, strip.top))
+            surface.blit(tile, (x + WIDTH, strip.top))
+            dirty.append(strip)
+
+        if world.score != self.score:
+            surface.blit(background, self.score_rect, self.score_rect)
+            dirty.append(self.score_rect)
+            score_text = font.render(f"Score: {world.score}", True, BLACK)
+            profiler.count('surfaces')
+            self.score_rect = surface.blit(score_text, (10, 10))
+            dirty.append(self.score_rect)
+            self.score = world.score
+
+        self.drawn = []
+        world.draw(surface, alpha, self.drawn)
+        overlay = profiler.draw_overlay(surface, overlay_font)
+        if overlay is not None:
+            self.drawn.append(overlay)
+        dirty.extend(self.drawn)
+
+        if self.needs_full_redraw:
+            pygame.display.update()
+            self.needs_full_redraw = False
+        else:
+            pygame.display.update(dirty)
 
 def game_over_screen():
-    # Display Game Over message
+    # Display Game Over message and wait; returns the next state
     SCREEN.fill(WHITE)
     game_over_text = font.render("Game Over!", True, BLACK)
     restart_text = font.render("Press R to Restart or Q to Quit", True, BLACK)
@@ -55,78 +351,86 @@ def game_over_screen():
     SCREEN.blit(restart_text, (WIDTH // 2 - restart_text.get_width() // 2, HEIGHT // 2))
     pygame.display.update()
 
-    waiting = True
-    while waiting:
+    while True:
         clock.tick(15)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                return STATE_QUIT
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    waiting = False
-                    main()  # Restart the game
+                    return STATE_PLAYING
                 elif event.key == pygame.K_q:
-                    pygame.quit()
-                    sys.exit()
+                    return STATE_QUIT
 
-def main():
-    global dino_y, dino_velocity, is_jumping, obstacle_x, score
+def play(world, renderer, frame_rate=FRAME_RATE):
+    # Runs one game in `world` until the dino crashes; returns the next state.
+    # Physics steps at world.sim_rate per second of real time, however fast
+    # frames are drawn, and each frame is interpolated between the last two steps.
+    world.reset()
+    renderer.needs_full_redraw = True
+    step_interval = 1000 / world.sim_rate
+    elapsed = 0
+    clock.tick()
 
-    # Reset game variables
-    dino_y = GROUND_HEIGHT - dino_height
-    dino_velocity = 0
-    is_jumping = False
-    obstacle_x = WIDTH
-    score = 0
+    while True:
+        elapsed += clock.tick(frame_rate)
+        profiler.end_frame()
 
-    running = True
-    while running:
-        clock.tick(60)
-        SCREEN.fill(WHITE)
-        pygame.draw.line(SCREEN, BLACK, (0, GROUND_HEIGHT), (WIDTH, GROUND_HEIGHT), 2)
+        with profiler.phase('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return STATE_QUIT
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                sys.exit()
+                # Jumping mechanism
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                    world.jump()
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    renderer.needs_full_redraw = True
 
-            # Jumping mechanism
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and not is_jumping:
-                    dino_velocity = -15
-                    is_jumping = True
+        steps = 0
+        while elapsed >= step_interval:
+            with profiler.phase('physics'):
+                world.update_physics()
 
-        # Apply gravity
-        if is_jumping:
-            dino_velocity += gravity
-            dino_y += dino_velocity
+            with profiler.phase('collision'):
+                collided = world.check_collision()
 
-            if dino_y >= GROUND_HEIGHT - dino_height:
-                dino_y = GROUND_HEIGHT - dino_height
-                is_jumping = False
+            if collided:
+                return STATE_GAME_OVER
 
-        # Move obstacle
-        obstacle_x -= obstacle_velocity
-        if obstacle_x < -obstacle_width:
-            obstacle_x = WIDTH + random.randint(0, 100)
-            score += 1  # Increase score when obstacle passes
+            elapsed -= step_interval
+            steps += 1
+            if steps == MAX_CATCH_UP_STEPS:
+                # Drop the rest of the backlog (see MAX_CATCH_UP_STEPS)
+                elapsed = 0
 
-        # Collision detection
-        dino_rect = pygame.Rect(dino_x, dino_y, dino_width, dino_height)
-        obstacle_rect = pygame.Rect(obstacle_x, obstacle_y, obstacle_width, obstacle_height)
+        with profiler.phase('draw'):
+            renderer.draw(world, elapsed / step_interval)
 
-        if dino_rect.colliderect(obstacle_rect):
-            game_over_screen()
-            return  # Exit the main function to prevent further updates
+def main(frame_rate=FRAME_RATE, sim_rate=SIM_RATE):
+    init_display()
+    world = DinoWorld(sim_rate=sim_rate)
+    renderer = DinoRenderer(SCREEN)
 
-        # Draw elements
-        draw_dino(dino_x, dino_y)
-        draw_obstacle(obstacle_x, obstacle_y)
-        show_score(score)
+    # Each screen returns the state to switch to, so restarting loops here
+    # instead of nesting calls
+    state = STATE_PLAYING
+    while state != STATE_QUIT:
+        if state == STATE_PLAYING:
+            state = play(world, renderer, frame_rate)
+        elif state == STATE_GAME_OVER:
+            state = game_over_screen()
 
-        pygame.display.update()
+    pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Chrome Dino Game")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="show frame timings on screen and write them to PATH (.csv or .json) on exit")
+    parser.add_argument('--fps', type=int, default=FRAME_RATE, help="frames drawn per second")
+    parser.add_argument('--sim-rate', type=float, default=SIM_RATE, help="physics steps per second")
+    args = parser.parse_args()
+    if args.profile:
+        profiler = FrameProfiler()
+        atexit.register(profiler.export, args.profile)
+    main(args.fps, args.sim_rate)
@@ -0,0 +1,152 @@
+"""Opt-in per-frame timing for the pygame games.
+
+The games time their hot phases with `profiler.phase(name)` and close each
+frame with `profiler.end_frame()`. By default `profiler` is NULL_PROFILER,
+whose methods do nothing. Running a game with --profile PATH swaps in a
+FrameProfiler. That draws a live overlay of p50/p95/p99 times over the last
+OVERLAY_WINDOW frames and writes every frame to PATH (CSV or JSON, by
+extension) on exit.
+
+Counters such as allocated surfaces are recorded per frame with
+`profiler.count(name)`.
+"""
+import csv
+import json
+import statistics
+import time
+from collections import defaultdict, deque
+from itertools import islice
+from contextlib import contextmanager, nullcontext
+
+# Frames kept for the summary and the trace; older frames are dropped
+MAX_FRAMES = 100_000
+# Most recent frames the live overlay reports on
+OVERLAY_WINDOW = 600
+# Seconds between overlay refreshes, so the overlay itself stays cheap
+OVERLAY_INTERVAL = 0.5
+
+
+class NullProfiler:
+    enabled = False
+    _null = nullcontext()
+
+    def phase(self, name):
+        return self._null
+
+    def count(self, name, amount=1):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def draw_overlay(self, surface, font):
+        return None
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, max_frames=MAX_FRAMES):
+        self.frames = deque(maxlen=max_frames)
+        self.current = defaultdict(float)
+        self.phases = []
+        self.counters = []
+        self.frame_start = time.perf_counter()
+        self.overlay = None
+        self.overlay_time = 0.0
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[name] += time.perf_counter() - start
+            if name not in self.phases:
+                self.phases.append(name)
+
+    def count(self, name, amount=1):
+        key = 'count:' + name
+        self.current[key] += amount
+        if key not in self.counters:
+            self.counters.append(key)
+
+    def end_frame(self):
+        now = time.perf_counter()
+        record = dict(self.current)
+        record['frame'] = now - self.frame_start
+        self.frames.append(record)
+        self.current.clear()
+        self.frame_start = now
+
+    def recent(self, count):
+        # The last count frames, oldest first, without copying the whole trace
+        return list(islice(reversed(self.frames), count))[::-1]
+
+    def percentiles(self, name, frames=None):
+        values = [frame.get(name, 0.0) for frame in (self.frames if frames is None else frames)]
+        if len(values) < 2:
+            return (values or [0.0]) * 3
+        q = statistics.quantiles(values, n=100, method='inclusive')
+        return q[49], q[94], q[98]
+
+    def summary(self):
+        # Milliseconds for timings, plain totals for counters
+        result = {}
+        for name in ['frame'] + self.phases:
+            p50, p95, p99 = self.percentiles(name)
+            result[name] = {'p50_ms': p50 * 1000, 'p95_ms': p95 * 1000, 'p99_ms': p99 * 1000}
+        for key in self.counters:
+            result[key] = {'total': sum(frame.get(key, 0) for frame in self.frames)}
+        return result
+
+    def export(self, path):
+        columns = ['frame'] + self.phases + self.counters
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for frame in self.frames:
+                    writer.writerow([frame.get(column, 0) for column in columns])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'summary': self.summary(),
+                           'frames': [{column: frame.get(column, 0) for column in columns}
+                                      for frame in self.frames]}, f)
+
+    def draw_overlay(self, surface, font):
+        # Draws the stats box in the bottom-left corner and returns its rect
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= OVERLAY_INTERVAL:
+            self.overlay = self.render_overlay(font)
+            self.overlay_time = now
+        rect = self.overlay.get_rect(bottomleft=(0, surface.get_height()))
+        surface.blit(self.overlay, rect)
+        return rect
+
+    def render_overlay(self, font):
+        import pygame
+
+        window = self.recent(OVERLAY_WINDOW)
+        lines = []
+        for name in ['frame'] + self.phases:
+            p50, p95, p99 = self.percentiles(name, window)
+            lines.append(f"{name:<10} p50 {p50 * 1000:6.2f}  p95 {p95 * 1000:6.2f}  p99 {p99 * 1000:6.2f} ms")
+        recent = window[-60:]
+        for key in self.counters:
+            lines.append(f"{key[6:]:<10} {sum(frame.get(key, 0) for frame in recent)} in last {len(recent)} frames")
+        rendered = [font.render(line, True, (255, 255, 0)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 8
+        height = sum(text.get_height() for text in rendered) + 8
+        overlay = pygame.Surface((width, height))
+        # The overlay's own text and box count like any other allocation
+        self.count('surfaces', len(rendered) + 1)
+        overlay.fill((0, 0, 0))
+        y = 4
+        for text in rendered:
+            overlay.blit(text, (4, y))
+            y += text.get_height()
+        return overlay
@@ -0,0 +1,118 @@
+"""Compute GPAs for many transcripts at once, without the GUI.
+
+Every input is a per-student CSV in the FileHandler format (Course Name,
+Weight, Grade) or a binary .gpab course file. Files are summarized in
+batches across a process pool. Each student's course count, total weight
+and GPA is streamed to the output as soon as its batch finishes. Files
+that can't be read are reported with an error instead of stopping the run.
+
+Usage:
+    python gpa_batch.py transcripts/ --output summary.csv
+    python gpa_batch.py 'term1/*.csv' 'term2/*.csv' --output summary.jsonl --workers 8
+"""
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from gpa_core import BINARY_EXTENSION, FileHandler, GPACalculator
+
+COLUMNS = ['student', 'file', 'courses', 'total_weight', 'gpa', 'error']
+
+
+def summarize(path):
+    calculator = GPACalculator()
+    summary = {'student': os.path.splitext(os.path.basename(path))[0], 'file': path, 'error': ''}
+    try:
+        calculator.set_courses(FileHandler.load_from_csv(path))
+    except (OSError, ValueError, IndexError, csv.Error, struct.error) as e:
+        summary['error'] = str(e)
+    summary.update(courses=len(calculator.courses), total_weight=calculator.get_total_weight(),
+                   gpa=calculator.calculate_gpa())
+    return summary
+
+
+def summarize_batch(paths):
+    # Runs in a worker process, one task per batch of files
+    return [summarize(path) for path in paths]
+
+
+def find_transcripts(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '*.csv')) +
+                                glob.glob(os.path.join(pattern, '*' + BINARY_EXTENSION))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    return paths
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def run_batch(paths, workers=None, batch_size=50):
+    # Yields one summary per path, in completion order
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(summarize_batch, batch) for batch in batched(paths, batch_size)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class SummaryWriter:
+    # Writes summaries as CSV, or as JSON Lines when the path ends in .jsonl
+    def __init__(self, path=None):
+        self.file = open(path, 'w', newline='') if path else sys.stdout
+        self.json_lines = bool(path) and path.endswith('.jsonl')
+        if not self.json_lines:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(COLUMNS)
+
+    def write(self, summary):
+        if self.json_lines:
+            self.file.write(json.dumps(summary) + '\n')
+        else:
+            self.writer.writerow([summary[column] for column in COLUMNS])
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute GPAs for many transcript CSVs")
+    parser.add_argument('paths', nargs='+', help="transcript files, directories of them, or glob patterns")
+    parser.add_argument('--output', metavar='PATH', help="summary file, .csv or .jsonl (default: CSV on stdout)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=50, help="files per worker task")
+    args = parser.parse_args()
+
+    paths = find_transcripts(args.paths)
+    writer = SummaryWriter(args.output)
+    start = time.perf_counter()
+    files = rows = errors = 0
+    try:
+        for summary in run_batch(paths, args.workers, args.batch_size):
+            writer.write(summary)
+            files += 1
+            rows += summary['courses']
+            errors += bool(summary['error'])
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"{files} files, {rows} rows, {errors} errors in {elapsed:.2f}s "
+          f"({files / elapsed:,.0f} files/s, {rows / elapsed:,.0f} rows/s)", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
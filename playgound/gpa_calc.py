@@ -1,68 +1,201 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
+import queue
+import sqlite3
+import threading
+
+from gpa_core import BINARY_EXTENSION, Course, CourseColumns, CourseStore, FileHandler, GPACalculator
+
+class BackgroundTask:
+    # Runs a generator on a worker thread. The worker never touches Tk: each
+    # value the generator yields goes through a queue that the Tk event loop
+    # drains with after(), calling on_step(value) and finally
+    # on_finish(cancelled, error). cancelled is only true when cancel() stopped
+    # the generator before it ran out. The queue is bounded, so a fast reader
+    # can't get far ahead of the UI.
+    POLL_INTERVAL = 50  # milliseconds
+
+    def __init__(self, root, steps, on_step, on_finish):
+        self.root = root
+        self.on_step = on_step
+        self.on_finish = on_finish
+        self.cancelled = threading.Event()
+        self.messages = queue.Queue(maxsize=4)
+        self.thread = threading.Thread(target=self.run, args=(steps,), daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_INTERVAL, self.poll)
+
+    def run(self, steps):
+        error = None
+        stopped_early = False
+        try:
+            for step in steps:
+                if self.cancelled.is_set():
+                    stopped_early = True
+                    break
+                self.messages.put(('step', step))
+        except Exception as e:
+            error = e
+        finally:
+            steps.close()
+        self.messages.put(('finish', (stopped_early, error)))
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def poll(self):
+        while True:
+            try:
+                kind, value = self.messages.get_nowait()
+            except queue.Empty:
+                self.root.after(self.POLL_INTERVAL, self.poll)
+                return
+            if kind == 'finish':
+                self.on_finish(*value)
+                return
+            self.on_step(value)
+
+class CourseTable:
+    # The course list. Rows use course IDs as Treeview iids and are inserted,
+    # updated and deleted one at a time. Above VIRTUAL_THRESHOLD courses the
+    # table switches to a virtual view: the Treeview only holds the rows in the
+    # visible window and the scrollbar drives which window that is. The window
+    # is sized to the rows the widget has room for and follows its resizes.
+    VIRTUAL_THRESHOLD = 2000
+    VISIBLE_ROWS = 20  # initial height, until the widget has been laid out
+
+    def __init__(self, parent, calculator):
+        self.calculator = calculator
+        self.virtual = False
+        self.first = 0
+        self.visible_rows = self.VISIBLE_ROWS
 
-class Course:
-    def __init__(self, course_name, weight, grade):
-        self.course_name = course_name
-        self.weight = float(weight)
-        self.grade = float(grade)
-    
-    def to_dict(self):
-        return {
-            'Course Name': self.course_name,
-            'Weight': self.weight,
-            'Grade': self.grade
-        }
-
-class GPACalculator:
-    def __init__(self):
-        self.courses = []
-    
-    def add_course(self, course):
-        self.courses.append(course)
-    
-    def remove_course(self, index):
-        del self.courses[index]
-    
-    def edit_course(self, index, new_course):
-        self.courses[index] = new_course
-    
-    def calculate_gpa(self):
-        total_weight = self.get_total_weight()
-        if total_weight == 0:
-            return 0
-        total_points = sum(course.grade * course.weight for course in self.courses)
-        return total_points / total_weight
-    
-    def get_total_weight(self):
-        return sum(course.weight for course in self.courses)
-
-class FileHandler:
-    @staticmethod
-    def save_to_csv(file_path, courses):
-        with open(file_path, 'w', newline='') as csvfile:
-            fieldnames = ['Course Name', 'Weight', 'Grade']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for course in courses:
-                writer.writerow(course.to_dict())
-    
-    @staticmethod
-    def load_from_csv(file_path):
-        courses = []
-        with open(file_path, 'r') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                course = Course(row['Course Name'], row['Weight'], row['Grade'])
-                courses.append(course)
-        return courses
+        columns = ('Course Name', 'Weight', 'Grade')
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings', height=self.VISIBLE_ROWS)
+        for col in columns:
+            self.tree.heading(col, text=col)
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL)
+        self.scrollbar.pack(side='right', fill='y')
+        self.use_native_scrolling()
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self.on_mouse_wheel)
+        self.tree.bind('<Configure>', self.on_resize, add='+')
+
+    def use_native_scrolling(self):
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+
+    def use_virtual_scrolling(self):
+        self.scrollbar.configure(command=self.on_scroll)
+        self.tree.configure(yscrollcommand='')
+
+    def bind(self, sequence, callback):
+        self.tree.bind(sequence, callback)
+
+    def selected_id(self):
+        selected_item = self.tree.focus()
+        return int(selected_item) if selected_item else None
+
+    def row_values(self, course):
+        return (course.course_name, course.weight, course.grade)
+
+    def reload(self):
+        self.tree.delete(*self.tree.get_children())
+        self.virtual = len(self.calculator.courses) > self.VIRTUAL_THRESHOLD
+        if self.virtual:
+            self.use_virtual_scrolling()
+            self.first = 0
+            self.refresh_window()
+            self.tree.update_idletasks()
+            self.fit_rows(self.tree.winfo_height())
+        else:
+            self.use_native_scrolling()
+            for course_id, course in zip(self.calculator.course_ids, self.calculator.courses):
+                self.tree.insert('', 'end', iid=course_id, values=self.row_values(course))
+
+    def insert(self, course_id):
+        if self.virtual:
+            self.refresh_window()
+        elif len(self.calculator.courses) > self.VIRTUAL_THRESHOLD:
+            self.reload()
+        else:
+            course = self.calculator.get_course(course_id)
+            self.tree.insert('', 'end', iid=course_id, values=self.row_values(course))
+
+    def update(self, course_id):
+        if self.tree.exists(course_id):
+            self.tree.item(course_id, values=self.row_values(self.calculator.get_course(course_id)))
+
+    def delete(self, course_id):
+        if self.virtual:
+            self.refresh_window()
+        elif self.tree.exists(course_id):
+            self.tree.delete(course_id)
+
+    def refresh_window(self):
+        # Rebuilds only the visible rows; cost depends on visible_rows, not
+        # on how many courses there are
+        total = len(self.calculator.courses)
+        self.first = max(0, min(self.first, total - self.visible_rows))
+        last = min(total, self.first + self.visible_rows)
+        focus = self.tree.focus()
+        self.tree.delete(*self.tree.get_children())
+        window = zip(self.calculator.course_ids[self.first:last], self.calculator.courses[self.first:last])
+        for course_id, course in window:
+            self.tree.insert('', 'end', iid=course_id, values=self.row_values(course))
+        if focus and self.tree.exists(focus):
+            self.tree.focus(focus)
+            self.tree.selection_set(focus)
+        if total:
+            self.scrollbar.set(self.first / total, last / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def on_scroll(self, action, amount, unit=None):
+        total = len(self.calculator.courses)
+        if action == 'moveto':
+            self.first = int(float(amount) * total)
+        elif unit == 'pages':
+            self.first += int(amount) * self.visible_rows
+        else:
+            self.first += int(amount)
+        self.refresh_window()
+
+    def on_resize(self, event):
+        self.fit_rows(event.height)
+
+    def fit_rows(self, height):
+        # Measures the heading and row height from the first row on screen;
+        # before any row is laid out the current size is kept
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ''
+        if not bbox:
+            return
+        heading, row_height = bbox[1], bbox[3]
+        rows = max(1, (height - heading) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            if self.virtual:
+                self.refresh_window()
+
+    def on_mouse_wheel(self, event):
+        if not self.virtual:
+            return None
+        if event.num == 4 or event.delta > 0:
+            self.on_scroll('scroll', -3, 'units')
+        else:
+            self.on_scroll('scroll', 3, 'units')
+        return 'break'
 
 class GPAApp:
     def __init__(self, root):
         self.root = root
         self.root.title("GPA Calculator")
         self.calculator = GPACalculator()
+        self.task = None
         self.create_widgets()
     
     def create_widgets(self):
@@ -88,17 +221,8 @@ class GPAApp:
         list_frame = ttk.Frame(self.root)
         list_frame.pack(fill="both", expand=True, padx=10, pady=5)
 
-        columns = ('Course Name', 'Weight', 'Grade')
-        self.course_tree = ttk.Treeview(list_frame, columns=columns, show='headings')
-        for col in columns:
-            self.course_tree.heading(col, text=col)
-        self.course_tree.pack(side='left', fill='both', expand=True)
-
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.course_tree.yview)
-        self.course_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side='right', fill='y')
-
-        self.course_tree.bind('<Double-1>', self.on_edit_course)
+        self.course_table = CourseTable(list_frame, self.calculator)
+        self.course_table.bind('<Double-1>', self.on_edit_course)
 
         # GPA Display Section
         gpa_frame = ttk.Frame(self.root)
@@ -112,11 +236,35 @@ class GPAApp:
         self.gpa_var = tk.StringVar(value="0.00")
         ttk.Label(gpa_frame, textvariable=self.gpa_var).grid(row=1, column=1, padx=5, pady=5)
 
+        # Query Section: totals over the courses matching the filters
+        query_frame = ttk.LabelFrame(self.root, text="Query")
+        query_frame.pack(fill="x", padx=10, pady=5)
+
+        self.query_vars = {}
+        for column, (key, label) in enumerate([('name_prefix', "Name starts with:"), ('min_grade', "Min grade:"),
+                                               ('max_grade', "Max grade:"), ('min_weight', "Min weight:")]):
+            ttk.Label(query_frame, text=label).grid(row=0, column=2 * column, padx=5, pady=5)
+            self.query_vars[key] = tk.StringVar()
+            ttk.Entry(query_frame, textvariable=self.query_vars[key], width=10).grid(row=0, column=2 * column + 1,
+                                                                                      padx=5, pady=5)
+        ttk.Button(query_frame, text="Run Query", command=self.run_query).grid(row=1, column=0, pady=5)
+        self.query_result_var = tk.StringVar()
+        ttk.Label(query_frame, textvariable=self.query_result_var).grid(row=1, column=1, columnspan=7, sticky='w')
+
+        # Progress Section, shown while a file is loading or saving
+        self.status_frame = ttk.Frame(self.root)
+        self.status_var = tk.StringVar()
+        ttk.Label(self.status_frame, textvariable=self.status_var).pack(side='left', padx=5)
+        self.progress = ttk.Progressbar(self.status_frame, mode='determinate', maximum=100)
+        self.progress.pack(side='left', fill='x', expand=True, padx=5)
+        ttk.Button(self.status_frame, text="Cancel", command=self.cancel_task).pack(side='right', padx=5)
+
         # Menu
         menubar = tk.Menu(self.root)
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Save Data", command=self.save_data)
         file_menu.add_command(label="Load Data", command=self.load_data)
+        file_menu.add_command(label="Open Database", command=self.open_database)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
@@ -132,18 +280,15 @@ class GPAApp:
             return
         try:
             course = Course(course_name, weight, grade)
-            self.calculator.add_course(course)
-            self.update_course_list()
+            course_id = self.calculator.add_course(course)
+            self.course_table.insert(course_id)
             self.clear_entry_fields()
             self.update_gpa_display()
         except ValueError:
             messagebox.showwarning("Input Error", "Please enter valid numbers for weight and grade.")
 
     def update_course_list(self):
-        for item in self.course_tree.get_children():
-            self.course_tree.delete(item)
-        for idx, course in enumerate(self.calculator.courses):
-            self.course_tree.insert('', 'end', iid=idx, values=(course.course_name, course.weight, course.grade))
+        self.course_table.reload()
 
     def clear_entry_fields(self):
         self.course_name_var.set('')
@@ -157,13 +302,12 @@ class GPAApp:
         self.gpa_var.set(f"{gpa:.2f}")
 
     def on_edit_course(self, event):
-        selected_item = self.course_tree.focus()
-        if selected_item:
-            idx = int(selected_item)
-            course = self.calculator.courses[idx]
-            self.open_edit_window(idx, course)
+        course_id = self.course_table.selected_id()
+        if course_id is not None:
+            course = self.calculator.get_course(course_id)
+            self.open_edit_window(course_id, course)
 
-    def open_edit_window(self, idx, course):
+    def open_edit_window(self, course_id, course):
         edit_window = tk.Toplevel(self.root)
         edit_window.title("Edit Course")
 
@@ -179,44 +323,144 @@ class GPAApp:
         grade_var = tk.StringVar(value=str(course.grade))
         ttk.Entry(edit_window, textvariable=grade_var).grid(row=2, column=1, padx=5, pady=5)
 
+        # IDs are only unique within one calculator, and Load Data or Open
+        # Database replaces it
+        calculator = self.calculator
+
+        def course_gone():
+            # The course was deleted or the data replaced while this window was open
+            if self.calculator is calculator and calculator.has_course(course_id):
+                return False
+            edit_window.destroy()
+            messagebox.showwarning("Edit Course", "This course no longer exists.")
+            return True
+
         def save_changes():
+            if course_gone():
+                return
             try:
                 new_course = Course(course_name_var.get(), weight_var.get(), grade_var.get())
-                self.calculator.edit_course(idx, new_course)
-                self.update_course_list()
+                self.calculator.update_course(course_id, new_course)
+                self.course_table.update(course_id)
                 self.update_gpa_display()
                 edit_window.destroy()
             except ValueError:
                 messagebox.showwarning("Input Error", "Please enter valid numbers for weight and grade.")
 
         def delete_course():
-            if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this course?"):
-                self.calculator.remove_course(idx)
-                self.update_course_list()
+            if course_gone():
+                return
+            confirmed = messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this course?")
+            # The dialog keeps the event loop running, so a load may have finished meanwhile
+            if confirmed and not course_gone():
+                self.calculator.delete_course(course_id)
+                self.course_table.delete(course_id)
                 self.update_gpa_display()
                 edit_window.destroy()
 
         ttk.Button(edit_window, text="Save Changes", command=save_changes).grid(row=3, column=0, pady=5)
         ttk.Button(edit_window, text="Delete Course", command=delete_course).grid(row=3, column=1, pady=5)
 
+    def set_calculator(self, calculator):
+        if isinstance(self.calculator, CourseStore):
+            self.calculator.close()
+        self.calculator = calculator
+        self.course_table.calculator = calculator
+        self.update_course_list()
+        self.update_gpa_display()
+
+    def open_database(self):
+        # Browses an SQLite course store in place; rows are paged in as they
+        # are shown rather than loaded up front
+        file_path = filedialog.askopenfilename(filetypes=[("SQLite databases", "*.db *.sqlite"),
+                                                          ("All files", "*.*")])
+        if file_path:
+            try:
+                self.set_calculator(CourseStore(file_path))
+            except sqlite3.Error as e:
+                messagebox.showerror("Open Error", f"An error occurred while opening the database: {e}")
+
+    def run_query(self):
+        filters = {}
+        try:
+            for key, var in self.query_vars.items():
+                value = var.get().strip()
+                if value:
+                    filters[key] = value if key == 'name_prefix' else float(value)
+        except ValueError:
+            messagebox.showwarning("Input Error", "Please enter valid numbers for grades and weight.")
+            return
+        count, total_weight, gpa = self.calculator.aggregate(**filters)
+        self.query_result_var.set(f"{count} courses, total weight {total_weight:.2f}, GPA {gpa:.2f}")
+
+    def start_task(self, description, steps, on_step, on_finish):
+        if self.task is not None:
+            steps.close()
+            messagebox.showwarning("Busy", "Please wait for the current load or save to finish.")
+            return
+
+        def finish(cancelled, error):
+            self.task = None
+            self.status_frame.pack_forget()
+            on_finish(cancelled, error)
+
+        self.status_var.set(description)
+        self.progress['value'] = 0
+        self.status_frame.pack(fill="x", padx=10, pady=5)
+        self.task = BackgroundTask(self.root, steps, on_step, finish)
+
+    def cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    def show_progress(self, done, total):
+        self.progress['value'] = 100 * done / total if total else 100
+
     def save_data(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv",
-                                                 filetypes=[("CSV files", "*.csv")])
+                                                 filetypes=[("CSV files", "*.csv"),
+                                                            ("Binary course files", "*" + BINARY_EXTENSION)])
         if file_path:
-            FileHandler.save_to_csv(file_path, self.calculator.courses)
-            messagebox.showinfo("Data Saved", "Course data has been saved successfully.")
+            # The copy is a consistent snapshot for the worker to write: copied
+            # columns in memory, or a read transaction on a database
+            courses = self.calculator.courses.copy()
+
+            def on_finish(cancelled, error):
+                if error is not None:
+                    messagebox.showerror("Save Error", f"An error occurred while saving data: {error}")
+                elif cancelled:
+                    messagebox.showinfo("Save Cancelled", "The file was not changed.")
+                else:
+                    messagebox.showinfo("Data Saved", "Course data has been saved successfully.")
+
+            self.start_task("Saving...", FileHandler.iter_save(file_path, courses),
+                            lambda step: self.show_progress(*step), on_finish)
 
     def load_data(self):
-        file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+        file_path = filedialog.askopenfilename(filetypes=[("Course files", "*.csv *" + BINARY_EXTENSION),
+                                                          ("All files", "*.*")])
         if file_path:
-            try:
-                courses = FileHandler.load_from_csv(file_path)
-                self.calculator.courses = courses
-                self.update_course_list()
-                self.update_gpa_display()
-                messagebox.showinfo("Data Loaded", "Course data has been loaded successfully.")
-            except Exception as e:
-                messagebox.showerror("Load Error", f"An error occurred while loading data: {e}")
+            loaded = CourseColumns()
+
+            def on_step(step):
+                chunk, done, total = step
+                loaded.extend(chunk)
+                self.show_progress(done, total)
+                self.status_var.set(f"Loading... {len(loaded):,} courses")
+
+            def on_finish(cancelled, error):
+                if error is not None:
+                    messagebox.showerror("Load Error", f"An error occurred while loading data: {error}")
+                elif cancelled:
+                    messagebox.showinfo("Load Cancelled", "The current courses were kept.")
+                else:
+                    # Loading a file always goes to memory, never over an open database
+                    calculator = GPACalculator()
+                    calculator.set_courses(loaded)
+                    self.set_calculator(calculator)
+                    messagebox.showinfo("Data Loaded", "Course data has been loaded successfully.")
+
+            self.start_task("Loading...", FileHandler.iter_load_csv(file_path), on_step, on_finish)
 
 def main():
     root = tk.Tk()
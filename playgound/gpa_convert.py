@@ -0,0 +1,52 @@
+"""Convert course files between CSV and the binary .gpab format.
+
+The source format is detected from the file contents and the target format
+from the destination's extension: .gpab writes binary, anything else CSV.
+
+Usage:
+    python gpa_convert.py transcript.csv transcript.gpab
+    python gpa_convert.py transcript.gpab transcript.csv
+    python gpa_convert.py archive/*.csv --to gpab      # next to each source file
+"""
+import argparse
+import os
+import sys
+import time
+
+from gpa_core import BINARY_EXTENSION, FileHandler
+
+
+def convert(source, destination):
+    courses = FileHandler.load_from_csv(source)
+    for _ in FileHandler.iter_save(destination, courses):
+        pass
+    return len(courses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert course files between CSV and binary")
+    parser.add_argument('paths', nargs='+', help="SOURCE DESTINATION, or several sources with --to")
+    parser.add_argument('--to', choices=['csv', 'gpab'],
+                        help="convert every path to this format, writing next to the source")
+    args = parser.parse_args()
+
+    if args.to:
+        extension = '.csv' if args.to == 'csv' else BINARY_EXTENSION
+        pairs = [(path, os.path.splitext(path)[0] + extension) for path in args.paths]
+    elif len(args.paths) == 2:
+        pairs = [tuple(args.paths)]
+    else:
+        parser.error("give SOURCE DESTINATION, or use --to with any number of sources")
+
+    for source, destination in pairs:
+        if os.path.abspath(source) == os.path.abspath(destination):
+            print(f"{source}: already in that format, skipped", file=sys.stderr)
+            continue
+        start = time.perf_counter()
+        rows = convert(source, destination)
+        print(f"{source} -> {destination}: {rows} courses in {time.perf_counter() - start:.2f}s",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
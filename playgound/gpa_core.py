@@ -0,0 +1,758 @@
+"""Courses, GPA totals and course files, without the GUI.
+
+gpa_calc builds the Tk app on top of these; gpa_batch and the other command
+line tools import them directly so they never load tkinter.
+"""
+import csv
+import itertools
+import math
+import mmap
+import operator
+import os
+import sqlite3
+import struct
+import sys
+from array import array
+from contextlib import contextmanager
+
+FIELDNAMES = ['Course Name', 'Weight', 'Grade']
+# Rows read or written between progress reports and cancellation checks
+CHUNK_SIZE = 10000
+
+# Binary course files: a header, then the weight and grade columns as
+# little-endian doubles, the name code column as uint32 padded to 8 bytes, the
+# end offset of every name as uint64, and the UTF-8 names back to back.
+# The header is magic, version, reserved, rows, names, name bytes.
+BINARY_MAGIC = b'GPAB'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHQQQ')
+BINARY_EXTENSION = '.gpab'
+
+class Course:
+    __slots__ = ('course_name', 'weight', 'grade')
+
+    def __init__(self, course_name, weight, grade):
+        self.course_name = course_name
+        self.weight = float(weight)
+        self.grade = float(grade)
+    
+    def to_dict(self):
+        return {
+            'Course Name': self.course_name,
+            'Weight': self.weight,
+            'Grade': self.grade
+        }
+
+class CourseColumns:
+    # Courses stored column by column: each distinct name once in a string
+    # table with the rows holding codes into it, and weights and grades as
+    # packed doubles. Indexing and iterating build Course objects on the fly,
+    # so code written for a list of courses keeps working.
+    def __init__(self, courses=()):
+        # The name table only grows, so copies can share it
+        self.names = []
+        self.name_codes = {}
+        self.codes = array('I')
+        self.weights = array('d')
+        self.grades = array('d')
+        # The mapped file behind read-only columns, see FileHandler.load_binary
+        self.source = None
+        self.extend(courses)
+
+    @classmethod
+    def from_columns(cls, names, codes, weights, grades, source=None):
+        courses = cls()
+        courses.names = names
+        courses.name_codes = {name: code for code, name in enumerate(names)}
+        courses.codes = codes
+        courses.weights = weights
+        courses.grades = grades
+        courses.source = source
+        return courses
+
+    def make_writable(self):
+        # Columns mapped from a binary file are read-only memoryviews; they are
+        # copied into arrays before the first change
+        if self.source is not None:
+            self.codes, self.weights, self.grades = (copy_column(column) for column in
+                                                     (self.codes, self.weights, self.grades))
+            self.source = None
+
+    def encode(self, name):
+        code = self.name_codes.get(name)
+        if code is None:
+            code = self.name_codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def append(self, course):
+        if self.source is not None:
+            self.make_writable()
+        self.codes.append(self.encode(course.course_name))
+        self.weights.append(course.weight)
+        self.grades.append(course.grade)
+
+    def extend(self, courses):
+        if isinstance(courses, CourseColumns) and not len(self):
+            # Take over a copy of the other store's columns in one go; columns
+            # mapped from a binary file stay zero-copy until something changes
+            other = courses.copy()
+            self.names, self.name_codes = other.names, other.name_codes
+            self.codes, self.weights, self.grades = other.codes, other.weights, other.grades
+            self.source = other.source
+            return
+        for course in courses:
+            self.append(course)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Course(self.names[self.codes[index]], self.weights[index], self.grades[index])
+
+    def __setitem__(self, index, course):
+        self.make_writable()
+        self.codes[index] = self.encode(course.course_name)
+        self.weights[index] = course.weight
+        self.grades[index] = course.grade
+
+    def __delitem__(self, index):
+        self.make_writable()
+        del self.codes[index]
+        del self.weights[index]
+        del self.grades[index]
+
+    def __iter__(self):
+        names = self.names
+        for code, weight, grade in zip(self.codes, self.weights, self.grades):
+            yield Course(names[code], weight, grade)
+
+    def pop(self, index=-1):
+        course = self[index]
+        del self[index]
+        return course
+
+    def copy(self):
+        other = CourseColumns()
+        other.names = self.names
+        other.name_codes = self.name_codes
+        if self.source is not None:
+            # Read-only columns can be shared
+            other.codes, other.weights, other.grades = self.codes, self.weights, self.grades
+            other.source = self.source
+        else:
+            other.codes, other.weights, other.grades = (copy_column(column) for column in
+                                                        (self.codes, self.weights, self.grades))
+        return other
+
+    def rows(self, start=0, stop=None):
+        # (name, weight, grade) tuples, without building Course objects
+        names = self.names
+        stop = len(self) if stop is None else stop
+        return zip(map(names.__getitem__, self.codes[start:stop]), self.weights[start:stop], self.grades[start:stop])
+
+    def total_weight(self):
+        return math.fsum(self.weights)
+
+    def total_points(self):
+        return math.fsum(map(operator.mul, self.grades, self.weights))
+
+def copy_column(column):
+    copy = array(column.format if isinstance(column, memoryview) else column.typecode)
+    copy.frombytes(memoryview(column).cast('B'))
+    return copy
+
+def file_order(column):
+    # Binary course files are little-endian; on a big-endian host this returns
+    # a byte-swapped copy, which converts a column either way
+    if sys.byteorder == 'little':
+        return column
+    column = copy_column(column)
+    column.byteswap()
+    return column
+
+class CompensatedSum:
+    # Running sum with Neumaier compensation, so that long sequences of
+    # additions and removals don't accumulate rounding error
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value):
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def subtract(self, value):
+        self.add(-value)
+
+    def reset(self):
+        self.total = 0.0
+        self.compensation = 0.0
+
+    @property
+    def value(self):
+        return self.total + self.compensation
+
+class GPACalculator:
+    def __init__(self):
+        self.courses = CourseColumns()
+        # Every course gets an ID that stays the same while other courses are
+        # added or removed, unlike its index
+        self.course_ids = array('q')
+        # Index of every course ID, kept in step with course_ids
+        self.positions = {}
+        self.next_id = 0
+        # Totals are kept up to date on every change, so reading them is O(1)
+        self.weight_sum = CompensatedSum()
+        self.points_sum = CompensatedSum()
+    
+    def add_course(self, course):
+        self.courses.append(course)
+        self.positions[self.next_id] = len(self.course_ids)
+        self.course_ids.append(self.next_id)
+        self.next_id += 1
+        self.weight_sum.add(course.weight)
+        self.points_sum.add(course.grade * course.weight)
+        return self.course_ids[-1]
+    
+    def remove_course(self, index):
+        course = self.courses.pop(index)
+        del self.positions[self.course_ids[index]]
+        del self.course_ids[index]
+        # Courses after the removed one move up by one
+        for i in range(index, len(self.course_ids)):
+            self.positions[self.course_ids[i]] = i
+        self.weight_sum.subtract(course.weight)
+        self.points_sum.subtract(course.grade * course.weight)
+    
+    def edit_course(self, index, new_course):
+        old_course = self.courses[index]
+        self.courses[index] = new_course
+        self.weight_sum.subtract(old_course.weight)
+        self.weight_sum.add(new_course.weight)
+        self.points_sum.subtract(old_course.grade * old_course.weight)
+        self.points_sum.add(new_course.grade * new_course.weight)
+
+    def set_courses(self, courses):
+        # Replaces all courses, e.g. after loading a file; CourseColumns are
+        # used as they are, anything else is copied into columns
+        self.courses = courses if isinstance(courses, CourseColumns) else CourseColumns(courses)
+        self.course_ids = array('q', range(self.next_id, self.next_id + len(self.courses)))
+        self.positions = dict(zip(self.course_ids, range(len(self.course_ids))))
+        self.next_id += len(self.courses)
+        self.weight_sum.reset()
+        self.points_sum.reset()
+        self.weight_sum.add(self.courses.total_weight())
+        self.points_sum.add(self.courses.total_points())
+    
+    def update_course(self, course_id, new_course):
+        self.edit_course(self.index_of(course_id), new_course)
+
+    def delete_course(self, course_id):
+        self.remove_course(self.index_of(course_id))
+
+    def has_course(self, course_id):
+        return course_id in self.positions
+
+    def index_of(self, course_id):
+        try:
+            return self.positions[course_id]
+        except KeyError:
+            raise ValueError(f"No course with ID {course_id}") from None
+
+    def get_course(self, course_id):
+        return self.courses[self.index_of(course_id)]
+
+    def aggregate(self, name_prefix=None, min_grade=None, max_grade=None, min_weight=None):
+        # (courses, total weight, GPA) over the courses matching every given filter
+        names = self.courses.names
+        weights = []
+        points = []
+        for code, weight, grade in zip(self.courses.codes, self.courses.weights, self.courses.grades):
+            if ((name_prefix is None or names[code].startswith(name_prefix))
+                    and (min_grade is None or grade >= min_grade)
+                    and (max_grade is None or grade <= max_grade)
+                    and (min_weight is None or weight >= min_weight)):
+                weights.append(weight)
+                points.append(weight * grade)
+        total_weight = math.fsum(weights)
+        return len(weights), total_weight, math.fsum(points) / total_weight if total_weight else 0
+
+    def calculate_gpa(self):
+        total_weight = self.get_total_weight()
+        if total_weight == 0:
+            return 0
+        return self.points_sum.value / total_weight
+    
+    def get_total_weight(self):
+        return self.weight_sum.value
+
+class StoreRows:
+    # The courses of a CourseStore in ID order as a read-only sequence, so the
+    # course table and the file writers can page through a store without
+    # loading it. With ids=True the items are the course IDs instead.
+    # Pages are found by keyset on id from the last page read, so scrolling
+    # only skips the rows in between rather than OFFSET rows from the start.
+    def __init__(self, store, ids=False):
+        self.store = store
+        self.ids = ids
+        self.columns = 'id' if ids else 'id, course_name, weight, grade'
+        # (index, ID, store version) of the last row read
+        self.anchor = None
+
+    def query(self, sql, params=()):
+        return self.store.connection.execute(sql, params)
+
+    def version(self):
+        return self.store.version
+
+    def make(self, row):
+        return row[0] if self.ids else Course(*row[1:])
+
+    def __len__(self):
+        return self.store.count
+
+    def id_at(self, index):
+        # Counts from whichever is closer, the first row or the anchor; the
+        # anchor is dropped once the store has changed
+        anchor = self.anchor if self.anchor and self.anchor[2] == self.version() else None
+        if anchor is None or index <= abs(index - anchor[0]):
+            sql, params = 'SELECT id FROM courses ORDER BY id LIMIT 1 OFFSET ?', (index,)
+        elif index >= anchor[0]:
+            sql, params = ('SELECT id FROM courses WHERE id >= ? ORDER BY id LIMIT 1 OFFSET ?',
+                           (anchor[1], index - anchor[0]))
+        else:
+            sql, params = ('SELECT id FROM courses WHERE id < ? ORDER BY id DESC LIMIT 1 OFFSET ?',
+                           (anchor[1], anchor[0] - index - 1))
+        row = self.query(sql, params).fetchone()
+        return None if row is None else row[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            first_id = self.id_at(start) if stop > start else None
+            if first_id is None:
+                return []
+            rows = self.query(f"SELECT {self.columns} FROM courses WHERE id >= ? ORDER BY id LIMIT ?",
+                              (first_id, stop - start)).fetchall()
+            if rows:
+                self.anchor = (start + len(rows) - 1, rows[-1][0], self.version())
+            return [self.make(row) for row in rows]
+        if index < 0:
+            index += len(self)
+        rows = self[index:index + 1] if index >= 0 else []
+        if not rows:
+            raise IndexError("course index out of range")
+        return rows[0]
+
+    def __iter__(self):
+        for row in self.query(f"SELECT {self.columns} FROM courses ORDER BY id"):
+            yield self.make(row)
+
+    def copy(self):
+        # An in-memory database can't be opened a second time, so its rows are
+        # copied out now instead
+        if self.store.path in (':memory:', ''):
+            return array('q', self) if self.ids else CourseColumns(self)
+        return StoreSnapshot(self.store.path, self.ids)
+
+class StoreSnapshot(StoreRows):
+    # StoreRows read through a connection of its own, opened on first use in a
+    # read transaction. It sees the store as it was at that moment and can be
+    # used from a worker thread, e.g. to save a store while it is being edited.
+    # close() ends the read transaction, which otherwise holds back WAL
+    # checkpoints; FileHandler's save methods close the snapshots they write.
+    def __init__(self, path, ids=False):
+        super().__init__(None, ids)
+        self.path = path
+        self.connection = None
+        self.count = 0
+
+    def query(self, sql, params=()):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, isolation_level=None)
+            self.connection.execute('BEGIN')
+            self.count = self.connection.execute('SELECT COUNT(*) FROM courses').fetchone()[0]
+        return self.connection.execute(sql, params)
+
+    def version(self):
+        # Nothing changes inside the read transaction
+        return 0
+
+    def __len__(self):
+        self.query('SELECT 1')
+        return self.count
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class CourseStore:
+    # A GPACalculator kept in an SQLite database instead of memory. It has the
+    # same methods, with course IDs being the table's row IDs. Queries and
+    # aggregates over subsets run in SQL against the name and grade indexes.
+    # Each change commits on its own unless it is made inside batch().
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS courses (
+            id INTEGER PRIMARY KEY,
+            course_name TEXT NOT NULL,
+            weight REAL NOT NULL,
+            grade REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS courses_course_name ON courses (course_name);
+        CREATE INDEX IF NOT EXISTS courses_grade ON courses (grade);
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL lets snapshots read while the store is being edited
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(self.SCHEMA)
+        self.courses = StoreRows(self)
+        self.course_ids = StoreRows(self, ids=True)
+        self.batch_depth = 0
+        # Bumped on every change, so StoreRows know when row indexes may have moved
+        self.version = 0
+        self.weight_sum = CompensatedSum()
+        self.points_sum = CompensatedSum()
+        self.load_totals()
+
+    def load_totals(self):
+        # The whole-store totals are read once and then kept up to date like
+        # GPACalculator's, so the GPA display doesn't rescan the table
+        count, total_weight, total_points = self.connection.execute(
+            'SELECT COUNT(*), TOTAL(weight), TOTAL(weight * grade) FROM courses').fetchone()
+        self.count = count
+        self.version += 1
+        self.weight_sum.reset()
+        self.weight_sum.add(total_weight)
+        self.points_sum.reset()
+        self.points_sum.add(total_points)
+
+    def close(self):
+        self.connection.close()
+
+    @contextmanager
+    def batch(self):
+        # Groups every change made inside into one transaction
+        self.batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if self.batch_depth == 1:
+                self.connection.rollback()
+                self.load_totals()
+            raise
+        finally:
+            self.batch_depth -= 1
+        if self.batch_depth == 0:
+            self.connection.commit()
+
+    def changed(self):
+        self.version += 1
+        if self.batch_depth == 0:
+            self.connection.commit()
+
+    def add_course(self, course):
+        cursor = self.connection.execute('INSERT INTO courses (course_name, weight, grade) VALUES (?, ?, ?)',
+                                         (course.course_name, course.weight, course.grade))
+        self.count += 1
+        self.weight_sum.add(course.weight)
+        self.points_sum.add(course.grade * course.weight)
+        self.changed()
+        return cursor.lastrowid
+
+    def add_courses(self, courses):
+        rows = courses.rows() if isinstance(courses, CourseColumns) else (
+            (course.course_name, course.weight, course.grade) for course in courses)
+        with self.batch():
+            self.connection.executemany('INSERT INTO courses (course_name, weight, grade) VALUES (?, ?, ?)', rows)
+            self.load_totals()
+
+    def set_courses(self, courses):
+        with self.batch():
+            self.connection.execute('DELETE FROM courses')
+            self.add_courses(courses)
+
+    def update_course(self, course_id, new_course):
+        old_course = self.get_course(course_id)
+        self.connection.execute('UPDATE courses SET course_name = ?, weight = ?, grade = ? WHERE id = ?',
+                                (new_course.course_name, new_course.weight, new_course.grade, course_id))
+        self.weight_sum.subtract(old_course.weight)
+        self.weight_sum.add(new_course.weight)
+        self.points_sum.subtract(old_course.grade * old_course.weight)
+        self.points_sum.add(new_course.grade * new_course.weight)
+        self.changed()
+
+    def delete_course(self, course_id):
+        course = self.get_course(course_id)
+        self.connection.execute('DELETE FROM courses WHERE id = ?', (course_id,))
+        self.count -= 1
+        self.weight_sum.subtract(course.weight)
+        self.points_sum.subtract(course.grade * course.weight)
+        self.changed()
+
+    def edit_course(self, index, new_course):
+        self.update_course(self.course_ids[index], new_course)
+
+    def remove_course(self, index):
+        self.delete_course(self.course_ids[index])
+
+    def has_course(self, course_id):
+        return self.connection.execute('SELECT 1 FROM courses WHERE id = ?', (course_id,)).fetchone() is not None
+
+    def index_of(self, course_id):
+        self.get_course(course_id)
+        return self.connection.execute('SELECT COUNT(*) FROM courses WHERE id < ?', (course_id,)).fetchone()[0]
+
+    def get_course(self, course_id):
+        row = self.connection.execute('SELECT course_name, weight, grade FROM courses WHERE id = ?',
+                                      (course_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"No course with ID {course_id}")
+        return Course(*row)
+
+    def calculate_gpa(self):
+        total_weight = self.get_total_weight()
+        if total_weight == 0:
+            return 0
+        return self.points_sum.value / total_weight
+
+    def get_total_weight(self):
+        return self.weight_sum.value
+
+    @staticmethod
+    def where(name_prefix=None, min_grade=None, max_grade=None, min_weight=None):
+        # SQL condition and parameters for the given filters. A name prefix
+        # becomes a range on course_name so that it can use the index.
+        conditions = []
+        params = []
+        if name_prefix:
+            end = CourseStore.prefix_end(name_prefix)
+            if end is None:
+                conditions.append('course_name >= ?')
+                params.append(name_prefix)
+            else:
+                conditions.append('course_name >= ? AND course_name < ?')
+                params += [name_prefix, end]
+        if min_grade is not None:
+            conditions.append('grade >= ?')
+            params.append(min_grade)
+        if max_grade is not None:
+            conditions.append('grade <= ?')
+            params.append(max_grade)
+        if min_weight is not None:
+            conditions.append('weight >= ?')
+            params.append(min_weight)
+        return ' AND '.join(conditions) or '1', params
+
+    @staticmethod
+    def prefix_end(prefix):
+        # The smallest string after every string starting with prefix, or None
+        # if the prefix is all U+10FFFF. Surrogates are skipped, as they can't
+        # be stored as text.
+        while prefix:
+            code = ord(prefix[-1]) + 1
+            if code == 0xD800:
+                code = 0xE000
+            if code <= 0x10FFFF:
+                return prefix[:-1] + chr(code)
+            prefix = prefix[:-1]
+        return None
+
+    def query(self, name_prefix=None, min_grade=None, max_grade=None, min_weight=None, limit=None):
+        # Yields (course ID, Course) for the matching courses in ID order
+        condition, params = self.where(name_prefix, min_grade, max_grade, min_weight)
+        sql = f'SELECT id, course_name, weight, grade FROM courses WHERE {condition} ORDER BY id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for course_id, *row in self.connection.execute(sql, params):
+            yield course_id, Course(*row)
+
+    def aggregate(self, name_prefix=None, min_grade=None, max_grade=None, min_weight=None):
+        # (courses, total weight, GPA) over the matching courses, computed in SQL
+        condition, params = self.where(name_prefix, min_grade, max_grade, min_weight)
+        count, total_weight, total_points = self.connection.execute(
+            f'SELECT COUNT(*), TOTAL(weight), TOTAL(weight * grade) FROM courses WHERE {condition}',
+            params).fetchone()
+        return count, total_weight, total_points / total_weight if total_weight else 0
+
+class FileHandler:
+    @staticmethod
+    def is_binary(file_path):
+        with open(file_path, 'rb') as f:
+            return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+    @staticmethod
+    def iter_save(file_path, courses):
+        # Binary for .gpab paths, CSV otherwise
+        if file_path.endswith(BINARY_EXTENSION):
+            return FileHandler.iter_save_binary(file_path, courses)
+        return FileHandler.iter_save_csv(file_path, courses)
+
+    @staticmethod
+    def done_with(courses):
+        # Called when a save finishes, fails or is cancelled
+        if isinstance(courses, StoreSnapshot):
+            courses.close()
+
+    @staticmethod
+    def save_to_csv(file_path, courses):
+        for _ in FileHandler.iter_save_csv(file_path, courses):
+            pass
+
+    @staticmethod
+    def iter_save_csv(file_path, courses, chunk_size=CHUNK_SIZE):
+        # Writes plain row tuples chunk by chunk, yielding (rows written, total
+        # rows) after each chunk. The file is written next to file_path and
+        # only replaces it once complete, so closing the generator early
+        # (cancelling) leaves any existing file untouched.
+        temp_path = file_path + '.part'
+        completed = False
+        try:
+            total = len(courses)
+            if isinstance(courses, CourseColumns):
+                rows = courses.rows()
+            else:
+                rows = ((course.course_name, course.weight, course.grade) for course in courses)
+            with open(temp_path, 'w', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(FIELDNAMES)
+                for start in range(0, total, chunk_size):
+                    writer.writerows(itertools.islice(rows, chunk_size))
+                    yield min(start + chunk_size, total), total
+            os.replace(temp_path, file_path)
+            completed = True
+            yield total, total
+        finally:
+            FileHandler.done_with(courses)
+            if not completed and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    @staticmethod
+    def save_to_binary(file_path, courses):
+        for _ in FileHandler.iter_save_binary(file_path, courses):
+            pass
+
+    @staticmethod
+    def iter_save_binary(file_path, courses):
+        # Yields (columns written, 3) after each column; like iter_save_csv it
+        # writes to a temporary file that only replaces file_path when complete
+        try:
+            columns = courses if isinstance(courses, CourseColumns) else CourseColumns(courses)
+        finally:
+            FileHandler.done_with(courses)
+        courses = columns
+        rows = len(courses)
+        encoded = [name.encode('utf-8') for name in courses.names]
+        ends = array('Q')
+        end = 0
+        for name in encoded:
+            end += len(name)
+            ends.append(end)
+        temp_path = file_path + '.part'
+        completed = False
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, rows, len(encoded), end))
+                f.write(file_order(courses.weights))
+                yield 1, 3
+                f.write(file_order(courses.grades))
+                yield 2, 3
+                f.write(file_order(courses.codes))
+                f.write(bytes(-4 * rows % 8))
+                f.write(file_order(ends))
+                f.write(b''.join(encoded))
+            os.replace(temp_path, file_path)
+            completed = True
+            yield 3, 3
+        finally:
+            if not completed and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def load_binary(file_path):
+        # Maps the file and uses its columns in place; nothing is copied, the
+        # name codes are only scanned for range and the name table decoded
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < BINARY_HEADER.size:
+                raise ValueError("Not a binary course file")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, rows, name_count, name_bytes = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a binary course file")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Binary course file version {version} is not supported (expected {BINARY_VERSION})")
+        offset = BINARY_HEADER.size
+        sizes = (8 * rows, 8 * rows, 4 * rows + -4 * rows % 8, 8 * name_count)
+        if offset + sum(sizes) + name_bytes != len(data):
+            raise ValueError("Binary course file is truncated or corrupt")
+        view = memoryview(data)
+        columns = []
+        for size, typecode in zip(sizes, 'ddIQ'):
+            columns.append(view[offset:offset + size].cast(typecode))
+            offset += size
+        # Used in place on little-endian hosts, as byte-swapped copies otherwise
+        weights, grades, codes, ends = (file_order(column) for column in columns)
+        codes = codes[:rows]
+        if rows and max(codes) >= name_count:
+            raise ValueError("Binary course file has a course name code out of range")
+        names = []
+        start = 0
+        for end in ends:
+            if end < start or end > name_bytes:
+                raise ValueError("Binary course file has a corrupt name table")
+            names.append(str(data[offset + start:offset + end], 'utf-8'))
+            start = end
+        if start != name_bytes:
+            raise ValueError("Binary course file has a corrupt name table")
+        source = data if sys.byteorder == 'little' else None
+        return CourseColumns.from_columns(names, codes, weights, grades, source)
+
+    @staticmethod
+    def load_from_csv(file_path):
+        # Binary course files are detected and loaded too
+        if FileHandler.is_binary(file_path):
+            return FileHandler.load_binary(file_path)
+        courses = CourseColumns()
+        for chunk, _, _ in FileHandler.iter_load_csv(file_path):
+            courses.extend(chunk)
+        return courses
+
+    @staticmethod
+    def iter_load_csv(file_path, chunk_size=CHUNK_SIZE):
+        # Yields (courses, bytes read, file size) chunk by chunk, so the file
+        # is never held in memory as a whole. A binary file is mapped and
+        # yielded as one chunk.
+        file_size = os.path.getsize(file_path)
+        if FileHandler.is_binary(file_path):
+            yield FileHandler.load_binary(file_path), file_size, file_size
+            return
+        with open(file_path, 'r', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            header = next(reader, None)
+            if header is None:
+                return
+            missing = [field for field in FIELDNAMES if field not in header]
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+            name_column, weight_column, grade_column = (header.index(field) for field in FIELDNAMES)
+            chunk = []
+            for row in reader:
+                if not row:
+                    continue
+                chunk.append(Course(row[name_column], row[weight_column], row[grade_column]))
+                if len(chunk) == chunk_size:
+                    yield chunk, csvfile.buffer.tell(), file_size
+                    chunk = []
+            if chunk:
+                yield chunk, file_size, file_size
@@ -1,9 +1,16 @@
 import pygame
 import sys
 import random
-
-# Initialize Pygame
-pygame.init()
+import argparse
+import atexit
+import math
+import os
+import time
+from collections import deque
+from functools import lru_cache
+from snake_replay import ReplayLog
+from snake_bot import BOTS
+from frame_profiler import NULL_PROFILER, FrameProfiler
 
 # Screen dimensions
 SCREEN_WIDTH = 640
@@ -19,43 +26,167 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED = (255, 0, 0)
 
+# Snake directions in the order replay logs encode them
+DIRECTIONS = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT]
+
+# Game ticks per second, and how often the game loop polls input and presents frames
+TICK_RATE = 10
+FRAME_RATE = 60
+
+# Turns a player can queue ahead of the snake; one is applied per tick and
+# presses beyond that are ignored
+MAX_BUFFERED_TURNS = 3
+
+# Ticks the loop may run in one frame to catch up before it drops the backlog
+MAX_CATCH_UP_TICKS = 5
+
+OPPOSITE = {pygame.K_UP: pygame.K_DOWN, pygame.K_DOWN: pygame.K_UP,
+            pygame.K_LEFT: pygame.K_RIGHT, pygame.K_RIGHT: pygame.K_LEFT}
+
+# Key maps handed out to players in order; later players need a bot to steer them
+KEY_MAPS = [
+    {pygame.K_UP: pygame.K_UP, pygame.K_DOWN: pygame.K_DOWN,
+     pygame.K_LEFT: pygame.K_LEFT, pygame.K_RIGHT: pygame.K_RIGHT},
+    {pygame.K_w: pygame.K_UP, pygame.K_s: pygame.K_DOWN,
+     pygame.K_a: pygame.K_LEFT, pygame.K_d: pygame.K_RIGHT},
+    {pygame.K_i: pygame.K_UP, pygame.K_k: pygame.K_DOWN,
+     pygame.K_j: pygame.K_LEFT, pygame.K_l: pygame.K_RIGHT},
+    {pygame.K_KP8: pygame.K_UP, pygame.K_KP5: pygame.K_DOWN,
+     pygame.K_KP4: pygame.K_LEFT, pygame.K_KP6: pygame.K_RIGHT},
+]
+
+# Colors for players after the first two
+PLAYER_COLORS = [(255, 128, 0), (128, 0, 255), (0, 128, 128), (255, 255, 255),
+                 (128, 128, 0), (255, 0, 128), (0, 255, 128), (128, 128, 255)]
+
+# Render modes: redraw the whole screen every frame, or only the cells that changed
+RENDER_FULL = 'full'
+RENDER_DIRTY = 'dirty'
+
+# Menus only need to notice key presses, so they don't have to spin any faster
+MENU_FPS = 30
+
 # Game states
 STATE_MAIN_MENU = 'main_menu'
 STATE_PLAYING = 'playing'
 STATE_GAME_OVER = 'game_over'
 
-# Set up the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Snake Game")
+# Swapped for a FrameProfiler by --profile
+profiler = NULL_PROFILER
+
 clock = pygame.time.Clock()
 
-# Fonts
-font_small = pygame.font.SysFont("Arial", 20)
-font_large = pygame.font.SysFont("Arial", 40)
+# The window and fonts are created by init_display() the first time something is
+# drawn, so importing this module (for bots, replays or tools) opens no window
+screen = None
+font_small = None
+font_large = None
 
 # Helper functions
+def init_display():
+    global screen, font_small, font_large
+    if screen is None:
+        pygame.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Snake Game")
+        font_small = pygame.font.SysFont("Arial", 20)
+        font_large = pygame.font.SysFont("Arial", 40)
+    return screen
+
+def cell_index(position, grid_width=GRID_WIDTH):
+    # Index of the grid cell under a pixel position, for the occupancy grids
+    x, y = position
+    return (y // GRID_SIZE) * grid_width + x // GRID_SIZE
+
+_tiles = {}
+
+def get_tile(color):
+    # One shared grid-sized surface per color, reused by every segment of that color
+    tile = _tiles.get(color)
+    if tile is None:
+        tile = pygame.Surface((GRID_SIZE, GRID_SIZE))
+        profiler.count('surfaces')
+        tile.fill(color)
+        _tiles[color] = tile
+    return tile
+
+@lru_cache(maxsize=256)
+def render_text(text, font, color):
+    # Rendering text is slow; the same strings are drawn frame after frame
+    profiler.count('surfaces')
+    return font.render(text, True, color)
+
 def draw_text(text, font, color, surface, x, y):
-    textobj = font.render(text, True, color)
+    textobj = render_text(text, font, color)
     textrect = textobj.get_rect(center=(x, y))
     surface.blit(textobj, textrect)
+    return textrect
 
 # Classes
+class FreeCells:
+    # Reference-counted grid occupancy shared by all snakes, plus the set of empty
+    # cells kept as a swap-remove array so a random empty cell is an O(1) pick.
+    # The counts double as the spatial index for head-versus-body checks.
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT):
+        self.width = width
+        self.height = height
+        num_cells = width * height
+        self.counts = bytearray(num_cells)
+        self.cells = list(range(num_cells))
+        self.index = list(range(num_cells))  # cell -> slot in self.cells, -1 if occupied
+
+    def __len__(self):
+        return len(self.cells)
+
+    def occupy(self, cell):
+        if self.counts[cell] == 0:
+            slot = self.index[cell]
+            last = self.cells.pop()
+            if last != cell:
+                self.cells[slot] = last
+                self.index[last] = slot
+            self.index[cell] = -1
+        self.counts[cell] += 1
+
+    def release(self, cell):
+        self.counts[cell] -= 1
+        if self.counts[cell] == 0:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def choice(self, rng=random):
+        return self.cells[rng.randrange(len(self.cells))]
+
 class SnakeSegment(pygame.sprite.Sprite):
-    def __init__(self, position, color):
-        super().__init__()
-        self.image = pygame.Surface((GRID_SIZE, GRID_SIZE))
-        self.image.fill(color)
+    def __init__(self, position, color, *groups):
+        super().__init__(*groups)
+        self.image = get_tile(color)
         self.rect = self.image.get_rect(topleft=position)
 
 class Snake:
-    def __init__(self, color, start_pos):
+    def __init__(self, color, start_pos, free_cells=None):
         self.color = color
-        self.segments = []
+        self.free_cells = free_cells
+        if free_cells is not None:
+            self.grid_width, self.grid_height = free_cells.width, free_cells.height
+        else:
+            self.grid_width, self.grid_height = GRID_WIDTH, GRID_HEIGHT
+        self.segments = deque()
         self.direction = pygame.K_RIGHT
-        self.positions = [start_pos]
+        self.positions = deque([start_pos])
         head = SnakeSegment(self.positions[0], self.color)
         self.segments.append(head)
         self.growing = False
+        # Cell given up by the last move, or None if the snake grew into it
+        self.vacated = None
+        # Number of this snake's segments on each grid cell, kept in step with positions
+        self.occupancy = bytearray(self.grid_width * self.grid_height)
+        self.occupancy[self.cell_index(start_pos)] = 1
+        if self.free_cells is not None:
+            self.free_cells.occupy(self.cell_index(start_pos))
+
+    def cell_index(self, position):
+        return cell_index(position, self.grid_width)
 
     def move(self):
         x, y = self.positions[0]
@@ -67,22 +198,38 @@ class Snake:
             x -= GRID_SIZE
         elif self.direction == pygame.K_RIGHT:
             x += GRID_SIZE
-        new_head_pos = (x % SCREEN_WIDTH, y % SCREEN_HEIGHT)
-        self.positions.insert(0, new_head_pos)
+        new_head_pos = (x % (self.grid_width * GRID_SIZE), y % (self.grid_height * GRID_SIZE))
+        self.positions.appendleft(new_head_pos)
+        head_cell = self.cell_index(new_head_pos)
+        self.occupancy[head_cell] += 1
+        if self.free_cells is not None:
+            self.free_cells.occupy(head_cell)
         if not self.growing:
-            self.positions.pop()
-            self.segments.pop()
+            tail_pos = self.positions.pop()
+            tail_cell = self.cell_index(tail_pos)
+            self.occupancy[tail_cell] -= 1
+            if self.free_cells is not None:
+                self.free_cells.release(tail_cell)
+            self.vacated = tail_pos
+            # Recycle the tail segment as the new head
+            new_head_segment = self.segments.pop()
+            new_head_segment.rect.topleft = new_head_pos
         else:
             self.growing = False
-        new_head_segment = SnakeSegment(new_head_pos, self.color)
-        self.segments.insert(0, new_head_segment)
+            self.vacated = None
+            # A new segment joins whatever sprite groups the snake is drawn from
+            new_head_segment = SnakeSegment(new_head_pos, self.color, *self.segments[0].groups())
+        self.segments.appendleft(new_head_segment)
 
     def grow(self):
         self.growing = True
 
+    def occupies(self, position):
+        return self.occupancy[self.cell_index(position)] > 0
+
     def check_collision(self):
-        # Check for collision with self
-        if self.positions[0] in self.positions[1:]:
+        # Check for collision with self: the head cell is also covered by the body
+        if self.occupancy[self.cell_index(self.positions[0])] > 1:
             return True
         return False
 
@@ -91,54 +238,88 @@ class Snake:
         return self.segments[0].rect
 
 class Food(pygame.sprite.Sprite):
-    def __init__(self):
+    def __init__(self, free_cells=None, rng=random):
         super().__init__()
-        self.image = pygame.Surface((GRID_SIZE, GRID_SIZE))
-        self.image.fill(RED)
+        self.free_cells = free_cells
+        self.rng = rng
+        self.image = get_tile(RED)
         self.rect = self.image.get_rect()
         self.spawn()
 
     def spawn(self):
-        x = random.randint(0, GRID_WIDTH - 1) * GRID_SIZE
-        y = random.randint(0, GRID_HEIGHT - 1) * GRID_SIZE
+        if self.free_cells is None:
+            x = self.rng.randint(0, GRID_WIDTH - 1) * GRID_SIZE
+            y = self.rng.randint(0, GRID_HEIGHT - 1) * GRID_SIZE
+        else:
+            # Only empty cells are candidates; a full board leaves the food where it is
+            if not self.free_cells:
+                return False
+            y, x = divmod(self.free_cells.choice(self.rng), self.free_cells.width)
+            x *= GRID_SIZE
+            y *= GRID_SIZE
         self.rect.topleft = (x, y)
+        return True
 
 class Player:
-    def __init__(self, player_id, color):
+    def __init__(self, player_id, color, free_cells=None, player_count=2, controls=None, controller=None):
         self.player_id = player_id
-        self.snake = Snake(color, self.start_position())
+        # A bot steering this player in place of the keyboard (see snake_bot.py)
+        self.controller = controller
+        self.player_count = player_count
+        if free_cells is not None:
+            self.grid_width, self.grid_height = free_cells.width, free_cells.height
+        else:
+            self.grid_width, self.grid_height = GRID_WIDTH, GRID_HEIGHT
+        self.snake = Snake(color, self.start_position(), free_cells)
         self.score = 0
-        self.set_controls()
+        # Turns pressed but not yet applied, so quick sequences survive a single tick
+        self.pending_turns = deque()
+        self.set_controls(controls)
 
     def start_position(self):
-        if self.player_id == 1:
-            return (100, 100)
-        elif self.player_id == 2:
-            return (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 100)
-
-    def set_controls(self):
-        if self.player_id == 1:
-            self.controls = {
-                pygame.K_UP: pygame.K_UP,
-                pygame.K_DOWN: pygame.K_DOWN,
-                pygame.K_LEFT: pygame.K_LEFT,
-                pygame.K_RIGHT: pygame.K_RIGHT
-            }
-        elif self.player_id == 2:
-            self.controls = {
-                pygame.K_w: pygame.K_UP,
-                pygame.K_s: pygame.K_DOWN,
-                pygame.K_a: pygame.K_LEFT,
-                pygame.K_d: pygame.K_RIGHT
-            }
+        if self.player_count <= 2:
+            # Opposite corners, 5 cells in from the edges
+            if self.player_id == 1:
+                x, y = 5, 5
+            else:
+                x, y = self.grid_width - 5, self.grid_height - 5
+        else:
+            # Spread larger arenas over an evenly spaced lattice
+            columns = math.ceil(math.sqrt(self.player_count))
+            rows = math.ceil(self.player_count / columns)
+            row, column = divmod(self.player_id - 1, columns)
+            x = (2 * column + 1) * self.grid_width // (2 * columns)
+            y = (2 * row + 1) * self.grid_height // (2 * rows)
+        return ((x % self.grid_width) * GRID_SIZE, (y % self.grid_height) * GRID_SIZE)
+
+    def set_controls(self, controls=None):
+        if controls is not None:
+            self.controls = controls
+        elif self.controller is not None:
+            # Bots press the direction keys themselves
+            self.controls = {direction: direction for direction in DIRECTIONS}
+        elif self.player_id <= len(KEY_MAPS):
+            self.controls = KEY_MAPS[self.player_id - 1]
+        else:
+            self.controls = {}
 
     def update_direction(self, key):
-        if key in self.controls:
+        # A full buffer ignores the press; dropping the oldest turn instead
+        # would leave the later ones checked against a turn that never happens
+        if key in self.controls and len(self.pending_turns) < MAX_BUFFERED_TURNS:
             new_direction = self.controls[key]
-            # Prevent the snake from reversing
-            opposite = {pygame.K_UP: pygame.K_DOWN, pygame.K_DOWN: pygame.K_UP,
-                        pygame.K_LEFT: pygame.K_RIGHT, pygame.K_RIGHT: pygame.K_LEFT}
-            if opposite[new_direction] != self.snake.direction:
+            # Judge the turn against the direction the snake will have once the
+            # turns already queued are applied
+            last_direction = self.pending_turns[-1] if self.pending_turns else self.snake.direction
+            # Prevent the snake from reversing, and drop repeats
+            if new_direction not in (last_direction, OPPOSITE[last_direction]):
+                self.pending_turns.append(new_direction)
+
+    def apply_turn(self):
+        # Called once per tick: take the next queued turn
+        if self.pending_turns:
+            new_direction = self.pending_turns.popleft()
+            if OPPOSITE[new_direction] != self.snake.direction:
                 self.snake.direction = new_direction
 
 # Main Game Class
@@ -146,18 +327,64 @@ class Game:
     def __init__(self, settings):
         self.settings = settings
         self.players = []
-        self.food = Food()
+        self.grid_width = settings.get('grid_width', GRID_WIDTH)
+        self.grid_height = settings.get('grid_height', GRID_HEIGHT)
+        self.free_cells = FreeCells(self.grid_width, self.grid_height)
         self.game_over = False
+        # Ids of the players whose head ran into a body
+        self.crashed = set()
+        self.tick = 0
+        # Food placement is the only randomness, so the seed plus the inputs replay a game
+        self.seed = settings.get('seed')
+        if self.seed is None:
+            self.seed = random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.render_mode = settings.get('render_mode', RENDER_FULL)
+        self.tick_rate = settings.get('tick_rate', TICK_RATE)
+        self.frame_rate = settings.get('frame_rate', FRAME_RATE)
+        # Pixel positions of cells changed since the last dirty-rect render
+        self.dirty_cells = set()
+        self.needs_full_redraw = True
+        # Where the profiler overlay was last drawn, if profiling
+        self.overlay_rect = None
+        # bots is a count of pathfinding bots or a list of snake_bot.BOTS names;
+        # bots join after the human players
+        bots = settings.get('bots', 0)
+        if isinstance(bots, int):
+            bots = ['pathfinding'] * bots
+        player_count = settings['player_count'] + len(bots)
+        # Per player: (score text, rect) of the label currently on screen
+        self.score_labels = [(None, pygame.Rect(0, 0, 0, 0))] * player_count
 
         # Initialize players
         colors = [self.settings['snake_color']]
-        if self.settings['player_count'] == 2:
+        if player_count >= 2:
             colors.append((0, 0, 255))  # Second player color
-
-        for i in range(self.settings['player_count']):
-            player = Player(i+1, colors[i])
+        for i in range(2, player_count):
+            colors.append(PLAYER_COLORS[(i - 2) % len(PLAYER_COLORS)])
+        key_maps = self.settings.get('key_maps', [])
+
+        for i in range(player_count):
+            controls = key_maps[i] if i < len(key_maps) else None
+            controller = None
+            if i >= self.settings['player_count']:
+                # Seeded from the game and player rather than drawn from
+                # self.rng, which would shift the food sequence
+                bot_rng = random.Random(f"{self.seed}-{i}")
+                controller = BOTS[bots[i - self.settings['player_count']]](bot_rng)
+            player = Player(i+1, colors[i], self.free_cells, player_count, controls, controller)
             self.players.append(player)
 
+        # Spawn food once the snakes are on the board so it never lands on one
+        self.food = Food(self.free_cells, self.rng)
+
+        # Direction changes are logged per tick when recording
+        self.replay = None
+        if settings.get('record'):
+            self.replay = ReplayLog(self.seed, player_count, self.grid_width, self.grid_height,
+                                    settings['snake_color'])
+            self.recorded_directions = [None] * player_count
+
         self.all_sprites = pygame.sprite.Group()
         for player in self.players:
             for segment in player.snake.segments:
@@ -165,30 +392,66 @@ class Game:
         self.all_sprites.add(self.food)
 
     def run(self):
+        # Fixed timestep: the game ticks tick_rate times per second of real time,
+        # while input is polled and frames presented at frame_rate
+        init_display()
         clock = pygame.time.Clock()
+        tick_interval = 1000 / self.tick_rate
+        elapsed = 0
         while not self.game_over:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return 'quit'
-                if event.type == pygame.KEYDOWN:
-                    # Quit the game by pressing 'Q'
-                    if event.key == pygame.K_q:
+            with profiler.phase('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
                         return 'quit'
-                    for player in self.players:
-                        player.update_direction(event.key)
+                    if event.type == pygame.KEYDOWN:
+                        # Quit the game by pressing 'Q'
+                        if event.key == pygame.K_q:
+                            return 'quit'
+                        for player in self.players:
+                            if player.controller is None:
+                                player.update_direction(event.key)
+                    if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self.needs_full_redraw = True
+
+            elapsed += clock.tick(self.frame_rate)
+            ticks = 0
+            while elapsed >= tick_interval and not self.game_over:
+                self.update()
+                elapsed -= tick_interval
+                ticks += 1
+                if ticks == MAX_CATCH_UP_TICKS:
+                    # Too far behind to catch up; slow down rather than stall
+                    elapsed = 0
+
+            # The picture only changes on a tick, so idle frames skip drawing
+            if ticks or self.needs_full_redraw:
+                self.render()
+            profiler.end_frame()
 
-            # Update game state
-            for player in self.players:
-                player.snake.move()
+        return 'game_over'
 
-                # Update all sprites with new segments
-                self.all_sprites.empty()
-                for p in self.players:
-                    for segment in p.snake.segments:
-                        self.all_sprites.add(segment)
-                self.all_sprites.add(self.food)
+    def update(self):
+        # Advance the game state by one tick
+        for player in self.players:
+            if player.controller is not None:
+                with profiler.phase('bots'):
+                    direction = player.controller.choose_direction(self, player)
+                if direction is not None:
+                    player.update_direction(DIRECTIONS[direction])
+            player.apply_turn()
+        if self.replay is not None:
+            self.record_directions()
 
+        for player in self.players:
+            with profiler.phase('move'):
+                player.snake.move()
+            self.dirty_cells.add(player.snake.positions[0])
+            if player.snake.vacated is not None:
+                self.dirty_cells.add(player.snake.vacated)
+
+            with profiler.phase('collision'):
                 if player.snake.check_collision():
+                    self.crashed.add(player.player_id)
                     self.game_over = True  # Game over
 
                 # Check food collision
@@ -196,40 +459,108 @@ class Game:
                     player.snake.grow()
                     player.score += 10
                     self.food.spawn()
-
-            # Check for collisions between snakes in two-player mode
-            if len(self.players) == 2:
-                # Player 1 collides with Player 2
-                if self.check_snake_collision(self.players[0], self.players[1]):
-                    self.game_over = True
-
-                # Player 2 collides with Player 1
-                if self.check_snake_collision(self.players[1], self.players[0]):
-                    self.game_over = True
-
-            # Render
-            screen.fill(BLACK)
-            for player in self.players:
-                for segment in player.snake.segments:
-                    screen.blit(segment.image, segment.rect)
-
-            # Draw food
-            screen.blit(self.food.image, self.food.rect)
-
-            # Draw scores
-            for idx, player in enumerate(self.players):
-                score_text = f"Player {player.player_id} Score: {player.score}"
-                draw_text(score_text, font_small, WHITE, screen, 100 + idx * 300, 20)
-
-            pygame.display.flip()
-            clock.tick(10)
-
-        return 'game_over'
+                    self.dirty_cells.add(self.food.rect.topleft)
+
+        # Check for collisions between snakes: a head hits another snake when the
+        # shared board has more segments on its cell than the snake itself
+        if len(self.players) > 1:
+            with profiler.phase('collision'):
+                counts = self.free_cells.counts
+                for player in self.players:
+                    head_cell = player.snake.cell_index(player.snake.positions[0])
+                    if counts[head_cell] > player.snake.occupancy[head_cell]:
+                        self.crashed.add(player.player_id)
+                        self.game_over = True
+
+        self.tick += 1
+
+    def record_directions(self):
+        for idx, player in enumerate(self.players):
+            if player.snake.direction != self.recorded_directions[idx]:
+                self.recorded_directions[idx] = player.snake.direction
+                self.replay.record(self.tick, idx, DIRECTIONS.index(player.snake.direction))
+
+    def save_replay(self, path):
+        self.replay.finish(self.tick, [player.score for player in self.players])
+        self.replay.save(path)
+
+    def render(self):
+        init_display()
+        with profiler.phase('render'):
+            if self.render_mode == RENDER_DIRTY and not self.needs_full_redraw:
+                self.render_dirty()
+            else:
+                self.render_full()
+
+    def render_full(self):
+        # all_sprites holds every segment and the food; snakes keep it up to date
+        screen.fill(BLACK)
+        self.all_sprites.draw(screen)
+
+        # Draw scores
+        for idx, player in enumerate(self.players):
+            score_text = f"Player {player.player_id} Score: {player.score}"
+            rect = draw_text(score_text, font_small, WHITE, screen, *self.score_label_center(idx))
+            self.score_labels[idx] = (score_text, rect)
+
+        self.overlay_rect = profiler.draw_overlay(screen, font_small)
+        pygame.display.flip()
+        self.dirty_cells.clear()
+        self.needs_full_redraw = False
+
+    def render_dirty(self):
+        # Repaint only the cells touched this tick and any score label that changed
+        rects = []
+        for x, y in self.dirty_cells:
+            rects.append(self.repaint(pygame.Rect(x, y, GRID_SIZE, GRID_SIZE)))
+        self.dirty_cells.clear()
+
+        for idx, player in enumerate(self.players):
+            score_text = f"Player {player.player_id} Score: {player.score}"
+            old_text, old_rect = self.score_labels[idx]
+            if score_text != old_text:
+                new_rect = render_text(score_text, font_small, WHITE).get_rect(center=self.score_label_center(idx))
+                self.score_labels[idx] = (score_text, new_rect)
+                rects.append(self.repaint(old_rect.union(new_rect)))
+
+        if self.overlay_rect is not None:
+            # The overlay sits on top of the cells repainted above
+            rects.append(self.repaint(self.overlay_rect))
+            self.overlay_rect = profiler.draw_overlay(screen, font_small)
+            rects.append(self.overlay_rect)
+
+        pygame.display.update(rects)
+
+    def score_label_center(self, idx):
+        # Two labels per row across the top of the screen
+        return (100 + (idx % 2) * 300, 20 + (idx // 2) * 20)
+
+    def repaint(self, rect):
+        # Redraw everything under rect: background, snake cells, food and score labels
+        rect = rect.clip(screen.get_rect())
+        screen.set_clip(rect)
+        screen.fill(BLACK)
+        grid_rect = rect.clip(pygame.Rect(0, 0, self.grid_width * GRID_SIZE, self.grid_height * GRID_SIZE))
+        counts = self.free_cells.counts
+        for gy in range(grid_rect.top // GRID_SIZE, (grid_rect.bottom - 1) // GRID_SIZE + 1):
+            for gx in range(grid_rect.left // GRID_SIZE, (grid_rect.right - 1) // GRID_SIZE + 1):
+                pos = (gx * GRID_SIZE, gy * GRID_SIZE)
+                if counts[gy * self.grid_width + gx]:
+                    for player in self.players:
+                        if player.snake.occupies(pos):
+                            screen.blit(get_tile(player.snake.color), pos)
+                if self.food.rect.topleft == pos:
+                    screen.blit(self.food.image, pos)
+        for score_text, label_rect in self.score_labels:
+            if label_rect.colliderect(rect):
+                screen.blit(render_text(score_text, font_small, WHITE), label_rect)
+        screen.set_clip(None)
+        return rect
 
     def check_snake_collision(self, player1, player2):
         # Check if player1's head collides with any segment of player2
         head_pos = player1.snake.positions[0]
-        if head_pos in player2.snake.positions:
+        if player2.snake.occupies(head_pos):
             return True
         return False
 
@@ -249,40 +580,51 @@ class MainMenu:
         self.player_count = 1
         self.step = 1  # Step 1: Choose color, Step 2: Choose player count
 
+    def draw(self):
+        screen.fill(BLACK)
+        draw_text("Snake Game", font_large, WHITE, screen, SCREEN_WIDTH // 2, 80)
+
+        if self.step == 1:
+            # Color selection
+            draw_text("Select Snake Color:", font_small, WHITE, screen, SCREEN_WIDTH // 2, 150)
+            for idx, color_name in enumerate(self.color_names):
+                color = WHITE if idx == self.selected_color else (100, 100, 100)
+                draw_text(color_name, font_small, color, screen, SCREEN_WIDTH // 2, 180 + idx * 30)
+            draw_text("Press ENTER to confirm color", font_small, WHITE, screen, SCREEN_WIDTH // 2, 330)
+
+        elif self.step == 2:
+            # Player count selection
+            draw_text("Select Player Count:", font_small, WHITE, screen, SCREEN_WIDTH // 2, 150)
+            player_counts = [1, 2]
+            for idx, count in enumerate(player_counts):
+                color = WHITE if count == self.player_count else (100, 100, 100)
+                draw_text(f"{count} Player", font_small, color, screen, SCREEN_WIDTH // 2, 180 + idx * 30)
+            draw_text("Press ENTER to confirm player count", font_small, WHITE, screen, SCREEN_WIDTH // 2, 270)
+
+        elif self.step == 3:
+            # Ready to start
+            draw_text("Press SPACE to Start the Game", font_small, WHITE, screen, SCREEN_WIDTH // 2, 200)
+
+        pygame.display.flip()
+
     def run(self):
+        init_display()
+        # The menu is static, so only redraw after a key press or when the window is exposed
+        needs_redraw = True
         while True:
-            screen.fill(BLACK)
-            draw_text("Snake Game", font_large, WHITE, screen, SCREEN_WIDTH // 2, 80)
-
-            if self.step == 1:
-                # Color selection
-                draw_text("Select Snake Color:", font_small, WHITE, screen, SCREEN_WIDTH // 2, 150)
-                for idx, color_name in enumerate(self.color_names):
-                    color = WHITE if idx == self.selected_color else (100, 100, 100)
-                    draw_text(color_name, font_small, color, screen, SCREEN_WIDTH // 2, 180 + idx * 30)
-                draw_text("Press ENTER to confirm color", font_small, WHITE, screen, SCREEN_WIDTH // 2, 330)
-
-            elif self.step == 2:
-                # Player count selection
-                draw_text("Select Player Count:", font_small, WHITE, screen, SCREEN_WIDTH // 2, 150)
-                player_counts = [1, 2]
-                for idx, count in enumerate(player_counts):
-                    color = WHITE if count == self.player_count else (100, 100, 100)
-                    draw_text(f"{count} Player", font_small, color, screen, SCREEN_WIDTH // 2, 180 + idx * 30)
-                draw_text("Press ENTER to confirm player count", font_small, WHITE, screen, SCREEN_WIDTH // 2, 270)
-
-            elif self.step == 3:
-                # Ready to start
-                draw_text("Press SPACE to Start the Game", font_small, WHITE, screen, SCREEN_WIDTH // 2, 200)
-
-            pygame.display.flip()
+            if needs_redraw:
+                self.draw()
+                needs_redraw = False
 
             # Event handling
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    needs_redraw = True
                 if event.type == pygame.KEYDOWN:
+                    needs_redraw = True
                     if self.step == 1:
                         if event.key == pygame.K_UP:
                             if self.selected_color > 0:
@@ -303,38 +645,61 @@ class MainMenu:
                         if event.key == pygame.K_SPACE:
                             return self.options
 
+            clock.tick(MENU_FPS)
+
 # Game Over Screen Class
 class GameOverScreen:
     def __init__(self, scores):
         self.scores = scores
 
-    def run(self):
-        while True:
-            screen.fill(BLACK)
-            draw_text("Game Over", font_large, RED, screen, SCREEN_WIDTH // 2, 80)
+    def draw(self):
+        screen.fill(BLACK)
+        draw_text("Game Over", font_large, RED, screen, SCREEN_WIDTH // 2, 80)
 
-            # Display scores
-            for idx, (player, score) in enumerate(self.scores.items()):
-                score_text = f"{player} Score: {score}"
-                draw_text(score_text, font_small, WHITE, screen, SCREEN_WIDTH // 2, 150 + idx * 30)
+        # Display scores
+        for idx, (player, score) in enumerate(self.scores.items()):
+            score_text = f"{player} Score: {score}"
+            draw_text(score_text, font_small, WHITE, screen, SCREEN_WIDTH // 2, 150 + idx * 30)
 
-            # Instructions
-            draw_text("Press R to Restart or Q to Quit", font_small, WHITE, screen, SCREEN_WIDTH // 2, 300)
+        # Instructions
+        draw_text("Press R to Restart or Q to Quit", font_small, WHITE, screen, SCREEN_WIDTH // 2, 300)
 
-            pygame.display.flip()
+        pygame.display.flip()
 
+    def run(self):
+        init_display()
+        # Nothing on this screen changes, so draw it once and redraw only when exposed
+        self.draw()
+        while True:
             # Event handling
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     return 'quit'
+                if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.draw()
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
                         return 'restart'
                     elif event.key == pygame.K_q:
                         return 'quit'
 
+            clock.tick(MENU_FPS)
+
 # Main Function
-def main():
+def replay_path(record_dir, seed):
+    # The seed tells apart games that end in the same second; the counter
+    # covers replays of a fixed seed
+    base = os.path.join(record_dir, time.strftime("snake-%Y%m%d-%H%M%S") + f"-{seed}")
+    path = base + ".snkr"
+    counter = 1
+    while os.path.exists(path):
+        path = f"{base}-{counter}.snkr"
+        counter += 1
+    return path
+
+def main(game_options=None, record_dir=None):
+    # game_options are extra Game settings, such as render_mode or tick_rate
+    game_options = dict(game_options or {}, record=record_dir is not None)
     game_state = STATE_MAIN_MENU
     main_menu = MainMenu()
     game = None
@@ -345,11 +710,13 @@ def main():
         if game_state == STATE_MAIN_MENU:
             selected_options = main_menu.run()
             if selected_options is not None:
-                game = Game(selected_options)
+                game = Game(dict(selected_options, **game_options))
                 game_state = STATE_PLAYING
 
         elif game_state == STATE_PLAYING:
             result = game.run()
+            if record_dir is not None:
+                game.save_replay(replay_path(record_dir, game.seed))
             if result == 'game_over':
                 game_over_screen = GameOverScreen(game.get_scores())
                 game_state = STATE_GAME_OVER
@@ -370,4 +737,20 @@ def main():
     sys.exit()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument('--render-mode', choices=[RENDER_FULL, RENDER_DIRTY], default=RENDER_FULL,
+                        help="'dirty' redraws only changed cells, for slow displays")
+    parser.add_argument('--tick-rate', type=float, default=TICK_RATE, help="game ticks per second")
+    parser.add_argument('--fps', type=int, default=FRAME_RATE, help="input polls and frames per second")
+    parser.add_argument('--bots', type=int, default=0, help="pathfinding bots to add to every game")
+    parser.add_argument('--record', metavar='DIR',
+                        help="save a replay of every game to DIR (play it with snake_replay.py)")
+    parser.add_argument('--profile', metavar='PATH',
+                        help="show frame timings on screen and write them to PATH (.csv or .json) on exit")
+    args = parser.parse_args()
+    if args.profile:
+        profiler = FrameProfiler()
+        atexit.register(profiler.export, args.profile)
+    main({'render_mode': args.render_mode, 'tick_rate': args.tick_rate, 'frame_rate': args.fps,
+          'bots': args.bots},
+         args.record)
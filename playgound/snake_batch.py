@@ -0,0 +1,174 @@
+"""Headless, vectorized Snake engine.
+
+Holds N independent games in NumPy arrays and advances all of them with a
+single ``step(actions)`` call. The rules follow ``snake.py``: the grid wraps
+around, eating food scores 10 and grows the snake on its next move, and a game
+ends when any head runs into a body (its own or another snake's). Food only
+spawns on empty cells. Nothing here touches pygame, so it is safe to use from
+sweeps, bots and tools.
+
+Example:
+    engine = BatchSnake(num_games=4096, num_players=2, seed=0)
+    while not engine.done.all():
+        engine.step(np.random.randint(0, 4, size=(4096, 2)))
+"""
+import numpy as np
+
+# Defaults match snake.py (640x480 screen with 20px cells)
+GRID_WIDTH = 32
+GRID_HEIGHT = 24
+
+# Direction codes used by step(); -1 keeps the current direction
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+KEEP = -1
+DX = np.array([0, 0, -1, 1], dtype=np.int64)
+DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int64)
+
+FOOD_SCORE = 10
+
+
+def start_cells(num_players, grid_width, grid_height):
+    # Players 1 and 2 start where snake.Player.start_position puts them
+    cells = [(5, 5), (grid_width - 5, grid_height - 5)]
+    for i in range(2, num_players):
+        cells.append(((i + 1) * grid_width // (num_players + 1), grid_height // 2))
+    return [(x % grid_width, y % grid_height) for x, y in cells[:num_players]]
+
+
+class BatchSnake:
+    def __init__(self, num_games, num_players=1, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT,
+                 max_length=None, seed=None):
+        self.num_games = num_games
+        self.num_players = num_players
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_cells = grid_width * grid_height
+        # Ring buffer capacity per snake; a snake can never be longer than the grid
+        self.max_length = min(max_length or self.num_cells, self.num_cells)
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_games, num_players)
+        self.body = np.zeros(shape + (self.max_length,), dtype=np.int32)
+        self.head_index = np.zeros(shape, dtype=np.int64)
+        self.length = np.ones(shape, dtype=np.int64)
+        self.direction = np.full(shape, RIGHT, dtype=np.int64)
+        self.growing = np.zeros(shape, dtype=bool)
+        self.scores = np.zeros(shape, dtype=np.int64)
+        # How many snake segments sit on each cell, summed over all players
+        self.occupancy = np.zeros((num_games, self.num_cells), dtype=np.int16)
+        self.food = np.zeros(num_games, dtype=np.int64)
+        self.done = np.zeros(num_games, dtype=bool)
+        self.ticks = np.zeros(num_games, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Restart the selected games (all of them when mask is None)."""
+        games = np.arange(self.num_games) if mask is None else np.flatnonzero(mask)
+        if games.size == 0:
+            return
+        self.occupancy[games] = 0
+        self.head_index[games] = 0
+        self.length[games] = 1
+        self.direction[games] = RIGHT
+        self.growing[games] = False
+        self.scores[games] = 0
+        self.done[games] = False
+        self.ticks[games] = 0
+        for p, (x, y) in enumerate(start_cells(self.num_players, self.grid_width, self.grid_height)):
+            cell = y * self.grid_width + x
+            self.body[games, p, 0] = cell
+            self.occupancy[games, cell] += 1
+        self._spawn_food(games)
+
+    @property
+    def heads(self):
+        """Cell index of every head, shape (num_games, num_players)."""
+        return np.take_along_axis(self.body, self.head_index[..., None], axis=2)[..., 0]
+
+    def cell_xy(self, cells):
+        return cells % self.grid_width, cells // self.grid_width
+
+    def snake_cells(self, game, player):
+        """Body of one snake as a list of cell indices, head first."""
+        length = self.length[game, player]
+        ring = (self.head_index[game, player] - np.arange(length)) % self.max_length
+        return self.body[game, player, ring].tolist()
+
+    def step(self, actions):
+        """Advance every running game by one tick.
+
+        actions is an int array of shape (num_games, num_players), or
+        (num_games,) for single-player batches, holding UP/DOWN/LEFT/RIGHT or
+        KEEP; anything else raises ValueError. Reversing into the snake's own
+        neck is ignored, as in snake.Player.update_direction. Finished games
+        are left untouched.
+
+        Returns (ate, crashed), two bool arrays of shape
+        (num_games, num_players).
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_games, self.num_players)
+        if actions.size and (actions.min() < KEEP or actions.max() > RIGHT):
+            raise ValueError(f"actions must be between {KEEP} (KEEP) and {RIGHT} (RIGHT)")
+        active = ~self.done
+        ate = np.zeros((self.num_games, self.num_players), dtype=bool)
+        crashed = np.zeros_like(ate)
+
+        turn = active[:, None] & (actions >= 0)
+        turn &= OPPOSITE[np.clip(actions, 0, 3)] != self.direction
+        self.direction = np.where(turn, actions, self.direction)
+
+        # Players move one after another, like the loop in Game.run, so a snake
+        # can eat food that respawned after an earlier player ate this tick
+        games = np.flatnonzero(active)
+        for p in range(self.num_players):
+            self._move(games, p, ate)
+
+        # Any head sharing its cell with another segment has collided
+        heads = self.heads[games]
+        crashed[games] = self.occupancy[games[:, None], heads] > 1
+        self.done[games] |= crashed[games].any(axis=1)
+        self.ticks[games] += 1
+        return ate, crashed
+
+    def _move(self, games, p, ate):
+        if games.size == 0:
+            return
+        w, h = self.grid_width, self.grid_height
+        head = self.body[games, p, self.head_index[games, p]]
+        d = self.direction[games, p]
+        x = (head % w + DX[d]) % w
+        y = (head // w + DY[d]) % h
+        new_head = y * w + x
+
+        growing = self.growing[games, p]
+        tail_index = (self.head_index[games, p] - self.length[games, p] + 1) % self.max_length
+        tail = self.body[games, p, tail_index]
+
+        head_index = (self.head_index[games, p] + 1) % self.max_length
+        self.head_index[games, p] = head_index
+        self.body[games, p, head_index] = new_head
+        np.add.at(self.occupancy, (games, new_head), 1)
+
+        # A snake that has filled its ring buffer stops growing
+        grows = growing & (self.length[games, p] < self.max_length)
+        self.length[games, p] += grows
+        shrink = ~grows
+        np.add.at(self.occupancy, (games[shrink], tail[shrink]), -1)
+        self.growing[games, p] = False
+
+        eating = new_head == self.food[games]
+        if eating.any():
+            eaters = games[eating]
+            ate[eaters, p] = True
+            self.growing[eaters, p] = True
+            self.scores[eaters, p] += FOOD_SCORE
+            self._spawn_food(eaters)
+
+    def _spawn_food(self, games):
+        # Pick a uniformly random empty cell per game; a full board keeps its food
+        noise = self.rng.random((games.size, self.num_cells))
+        noise[self.occupancy[games] > 0] = -1.0
+        choice = noise.argmax(axis=1)
+        has_room = noise[np.arange(games.size), choice] >= 0
+        self.food[games[has_room]] = choice[has_room]
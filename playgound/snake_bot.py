@@ -0,0 +1,285 @@
+"""Pathfinding autopilot for snake.Game.
+
+A bot is attached to a Player as its controller. Every tick Game.update asks it
+for a direction (UP, DOWN, LEFT or RIGHT, in snake.DIRECTIONS order) and feeds
+it to Player.update_direction like a key press.
+
+PathfindingBot keeps a BFS distance field from the food over empty cells and
+reuses it across ticks:
+  * cells vacated by tails are folded in with an incremental decrease-only
+    repair instead of a new search;
+  * cells newly covered by heads are left stale; the greedy walk down the
+    field notices when it gets stuck and only then rebuilds the field;
+  * the field is rebuilt from scratch when the food moves, so every food
+    eaten costs one full search; the repairs only save searches between
+    two foods.
+Before committing to a path to the food, the bot checks that its own tail
+would still be reachable after eating. If not, it follows its tail instead.
+Accepted paths are cached and followed until something blocks them.
+
+GreedyBot and RandomBot are cheap baselines for tournaments.
+
+Every bot is built as BOTS[name](rng) with a random.Random of its own, so
+games with random bots replay from their seed; bots without random choices
+ignore it.
+"""
+import random
+from collections import deque
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+INF = 1 << 30
+
+
+class GridGraph:
+    # Wrapping 4-neighbour grid over cell indices, as laid out by snake.FreeCells
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.num_cells = width * height
+
+    def neighbors(self, cell):
+        w, h = self.width, self.height
+        y, x = divmod(cell, w)
+        return (((y - 1) % h) * w + x, ((y + 1) % h) * w + x,
+                y * w + (x - 1) % w, y * w + (x + 1) % w)
+
+    def direction(self, from_cell, to_cell):
+        return self.neighbors(from_cell).index(to_cell)
+
+
+class PathfindingBot:
+    def __init__(self, rng=None):
+        self.graph = None
+        self.field = None
+        self.field_food = None
+        self.plan = deque()
+        self.plan_food = None
+        # Counters for benchmarks
+        self.full_searches = 0
+        self.repairs = 0
+
+    def choose_direction(self, game, player):
+        board = game.free_cells
+        if self.graph is None or self.graph.num_cells != board.width * board.height:
+            self.graph = GridGraph(board.width, board.height)
+            self.field = None
+        snake = player.snake
+        counts = board.counts
+        head = snake.cell_index(snake.positions[0])
+        food = snake.cell_index(game.food.rect.topleft)
+
+        # The field is kept current every tick, also while following a plan, so
+        # a blocked plan can be replaced by walking the field without a search
+        self.update_field(game, food)
+
+        # Keep following an accepted path while it is still open
+        if self.plan and self.plan_food == food and counts[self.plan[0]] == 0 \
+                and self.plan[0] in self.graph.neighbors(head):
+            return self.graph.direction(head, self.plan.popleft())
+        self.plan.clear()
+
+        path = self.descend(head, food, counts)
+        if path is None:
+            self.rebuild_field(food, counts)
+            path = self.descend(head, food, counts)
+        if path is not None and self.tail_reachable_after(snake, path, counts):
+            self.plan = deque(path)
+            self.plan_food = food
+            return self.graph.direction(head, self.plan.popleft())
+
+        step = self.step_toward_tail(snake, head, counts)
+        if step is None:
+            step = self.roomiest_step(head, counts)
+        if step is None:
+            return None
+        return self.graph.direction(head, step)
+
+    def update_field(self, game, food):
+        counts = game.free_cells.counts
+        if self.field is None or self.field_food != food:
+            self.rebuild_field(food, counts)
+            return
+        # Tails that moved this tick opened cells; pull their distances down
+        field = self.field
+        queue = deque()
+        for player in game.players:
+            vacated = player.snake.vacated
+            if vacated is None:
+                continue
+            cell = player.snake.cell_index(vacated)
+            if counts[cell]:
+                continue
+            best = min(field[n] for n in self.graph.neighbors(cell)) + 1
+            if best < field[cell]:
+                field[cell] = best
+                queue.append(cell)
+        if queue:
+            self.repairs += 1
+        while queue:
+            cell = queue.popleft()
+            next_distance = field[cell] + 1
+            for n in self.graph.neighbors(cell):
+                if counts[n] == 0 and field[n] > next_distance:
+                    field[n] = next_distance
+                    queue.append(n)
+
+    def rebuild_field(self, food, counts):
+        self.full_searches += 1
+        field = [INF] * self.graph.num_cells
+        field[food] = 0
+        queue = deque([food])
+        while queue:
+            cell = queue.popleft()
+            next_distance = field[cell] + 1
+            for n in self.graph.neighbors(cell):
+                if counts[n] == 0 and field[n] == INF:
+                    field[n] = next_distance
+                    queue.append(n)
+        self.field = field
+        self.field_food = food
+
+    def descend(self, head, food, counts):
+        # Walk strictly downhill through empty cells; None when the field is stale
+        field = self.field
+        path = []
+        cell = head
+        distance = min(field[n] for n in self.graph.neighbors(head)) + 1
+        if distance > INF:
+            return None
+        while cell != food:
+            best = None
+            for n in self.graph.neighbors(cell):
+                if field[n] < distance and (counts[n] == 0 or n == food):
+                    if best is None or field[n] < field[best]:
+                        best = n
+            if best is None:
+                return None
+            cell = best
+            distance = field[cell]
+            path.append(cell)
+        return path
+
+    def tail_reachable_after(self, snake, path, counts):
+        # Move a virtual copy of the snake along path and check its new head can
+        # still reach its tail, so eating the food does not seal it in
+        body = [snake.cell_index(position) for position in snake.positions]
+        # Eating the food at the end of path grows the snake by one segment
+        virtual = (path[::-1] + body)[:len(body) + 1]
+        new_head, tail = virtual[0], virtual[-1]
+        if new_head == tail:
+            return True
+        own = snake.occupancy
+        virtual_body = set(virtual[:-1])
+        seen = {new_head}
+        queue = deque([new_head])
+        while queue:
+            cell = queue.popleft()
+            for n in self.graph.neighbors(cell):
+                if n == tail:
+                    return True
+                if n in seen or n in virtual_body:
+                    continue
+                # Cells held by other snakes stay blocked; our own old body has moved on
+                if counts[n] - own[n] > 0:
+                    continue
+                seen.add(n)
+                queue.append(n)
+        return False
+
+    def step_toward_tail(self, snake, head, counts):
+        # First step of a shortest path from the head to the snake's own tail
+        if len(snake.positions) < 2:
+            return None
+        tail = snake.cell_index(snake.positions[-1])
+        parents = {head: None}
+        queue = deque([head])
+        while queue:
+            cell = queue.popleft()
+            for n in self.graph.neighbors(cell):
+                if n in parents or (counts[n] and n != tail):
+                    continue
+                parents[n] = cell
+                if n == tail:
+                    while parents[n] != head:
+                        n = parents[n]
+                    # Stepping onto the tail itself only works if it moves away
+                    # this tick (and a two-cell snake cannot turn back onto it)
+                    if n == tail and (len(snake.positions) <= 2 or snake.growing):
+                        return None
+                    return n
+                queue.append(n)
+        return None
+
+    def roomiest_step(self, head, counts):
+        # Last resort: the empty neighbour with the most room behind it
+        best, best_room = None, -1
+        for n in self.graph.neighbors(head):
+            if counts[n]:
+                continue
+            room = self.flood_size(n, counts, limit=self.graph.num_cells)
+            if room > best_room:
+                best, best_room = n, room
+        return best
+
+    def flood_size(self, start, counts, limit):
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < limit:
+            cell = queue.popleft()
+            for n in self.graph.neighbors(cell):
+                if n not in seen and counts[n] == 0:
+                    seen.add(n)
+                    queue.append(n)
+        return len(seen)
+
+
+class GreedyBot:
+    # Heads straight for the food along the shorter axis, dodging only the next cell
+    def __init__(self, rng=None):
+        self.graph = None
+
+    def choose_direction(self, game, player):
+        board = game.free_cells
+        if self.graph is None or self.graph.num_cells != board.width * board.height:
+            self.graph = GridGraph(board.width, board.height)
+        snake = player.snake
+        w, h = board.width, board.height
+        hy, hx = divmod(snake.cell_index(snake.positions[0]), w)
+        fy, fx = divmod(snake.cell_index(game.food.rect.topleft), w)
+        # Signed shortest offsets on the wrapping grid
+        dx = (fx - hx + w // 2) % w - w // 2
+        dy = (fy - hy + h // 2) % h - h // 2
+        preferred = []
+        if dx:
+            preferred.append(RIGHT if dx > 0 else LEFT)
+        if dy:
+            preferred.append(DOWN if dy > 0 else UP)
+        neighbors = self.graph.neighbors(snake.cell_index(snake.positions[0]))
+        for direction in preferred + [UP, DOWN, LEFT, RIGHT]:
+            if board.counts[neighbors[direction]] == 0:
+                return direction
+        return None
+
+
+class RandomBot:
+    # Picks a random empty neighbour; a baseline for tournaments
+    def __init__(self, rng=None):
+        self.graph = None
+        self.rng = rng or random.Random()
+
+    def choose_direction(self, game, player):
+        board = game.free_cells
+        if self.graph is None or self.graph.num_cells != board.width * board.height:
+            self.graph = GridGraph(board.width, board.height)
+        snake = player.snake
+        neighbors = self.graph.neighbors(snake.cell_index(snake.positions[0]))
+        free = [d for d in (UP, DOWN, LEFT, RIGHT) if board.counts[neighbors[d]] == 0]
+        return self.rng.choice(free) if free else None
+
+
+# Bots by name, for Game's bots setting and the tournament runner
+BOTS = {
+    'pathfinding': PathfindingBot,
+    'greedy': GreedyBot,
+    'random': RandomBot,
+}
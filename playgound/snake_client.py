@@ -0,0 +1,172 @@
+"""Thin client for snake_server.py, plus a load generator.
+
+The client only mirrors the server's state from snapshots and deltas and sends
+direction bytes; all game rules run on the server.
+
+Usage:
+    python snake_client.py --port 8765              # play with the arrow keys
+    python snake_client.py --load 500 --duration 30 # 500 simulated players
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import snake_protocol as protocol
+
+CELL_SIZE = 20
+FRAME_RATE = 60
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+COLORS = [(0, 255, 0), (0, 0, 255), (255, 128, 0), (128, 0, 255), (0, 128, 128), (255, 255, 0)]
+
+
+async def read_frame(reader):
+    header = await reader.readexactly(protocol.FRAME_HEADER.size)
+    (length,) = protocol.FRAME_HEADER.unpack(header)
+    body = await reader.readexactly(length)
+    return body[0], body[1:]
+
+
+async def receive(reader, state, stats=None):
+    # Apply frames to state until the server ends the game or hangs up
+    try:
+        while not state.game_over:
+            message_type, payload = await read_frame(reader)
+            if stats is not None:
+                stats.on_frame(message_type, len(payload) + protocol.FRAME_HEADER.size + 1)
+            state.apply(message_type, payload)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+
+async def play(host, port):
+    import pygame
+
+    reader, writer = await asyncio.open_connection(host, port)
+    state = protocol.ClientState()
+    receiver = asyncio.create_task(receive(reader, state))
+
+    pygame.init()
+    screen = pygame.display.set_mode((640, 480))
+    pygame.display.set_caption("Snake Client")
+    font = pygame.font.SysFont("Arial", 20)
+    keys = {pygame.K_UP: protocol.UP, pygame.K_DOWN: protocol.DOWN,
+            pygame.K_LEFT: protocol.LEFT, pygame.K_RIGHT: protocol.RIGHT}
+    drawn_tick = None
+    try:
+        while not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type == pygame.KEYDOWN and event.key in keys:
+                    writer.write(bytes((keys[event.key],)))
+            if state.you is not None and state.tick != drawn_tick:
+                draw(screen, font, state)
+                drawn_tick = state.tick
+            await asyncio.sleep(1 / FRAME_RATE)
+        print("Game over, scores:", state.scores)
+    finally:
+        receiver.cancel()
+        writer.close()
+        pygame.quit()
+
+
+def draw(screen, font, state):
+    import pygame
+
+    screen.fill(BLACK)
+    for index, cells in enumerate(state.snakes):
+        color = COLORS[index % len(COLORS)]
+        for cell in cells:
+            y, x = divmod(cell, state.width)
+            pygame.draw.rect(screen, color, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    y, x = divmod(state.food, state.width)
+    pygame.draw.rect(screen, RED, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    text = f"You are Player {state.you + 1}   Scores: " + " / ".join(map(str, state.scores))
+    screen.blit(font.render(text, True, WHITE), (10, 10))
+    pygame.display.flip()
+
+
+class LoadStats:
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.round_trips = []
+        self.ping_sent = {}
+
+    def on_frame(self, message_type, size):
+        self.frames += 1
+        self.bytes += size
+
+
+async def simulated_player(host, port, stats, duration, ping_interval):
+    reader, writer = await asyncio.open_connection(host, port)
+    state = protocol.ClientState()
+    pings = asyncio.Queue()
+
+    class PlayerStats:
+        # Times PONG frames against the pings this player sent
+        def on_frame(self, message_type, size):
+            stats.on_frame(message_type, size)
+            if message_type == protocol.PONG and not pings.empty():
+                stats.round_trips.append(time.perf_counter() - pings.get_nowait())
+
+    receiver = asyncio.create_task(receive(reader, state, PlayerStats()))
+    deadline = time.perf_counter() + duration
+    next_ping = time.perf_counter()
+    try:
+        while not receiver.done() and time.perf_counter() < deadline:
+            if state.you is not None and random.random() < 0.2:
+                writer.write(bytes((random.randrange(4),)))
+            if time.perf_counter() >= next_ping:
+                pings.put_nowait(time.perf_counter())
+                writer.write(bytes((protocol.PING,)))
+                next_ping += ping_interval
+            await asyncio.sleep(0.1)
+    except ConnectionError:
+        pass
+    finally:
+        receiver.cancel()
+        writer.close()
+
+
+async def generate_load(host, port, players, duration, ping_interval):
+    stats = LoadStats()
+    start = time.perf_counter()
+
+    async def keep_playing():
+        # Reconnect whenever a game ends so the load stays constant
+        while time.perf_counter() - start < duration:
+            await simulated_player(host, port, stats, duration - (time.perf_counter() - start), ping_interval)
+
+    await asyncio.gather(*(keep_playing() for _ in range(players)))
+    elapsed = time.perf_counter() - start
+    print(f"{players} players for {elapsed:.1f}s: {stats.frames / elapsed:.0f} frames/s, "
+          f"{stats.bytes / elapsed / 1024:.1f} KiB/s total, "
+          f"{stats.bytes / elapsed / players:.0f} B/s per player")
+    if len(stats.round_trips) > 1:
+        rtts = sorted(stats.round_trips)
+        q = statistics.quantiles(rtts, n=100, method='inclusive')
+        print(f"round trip: p50 {q[49] * 1000:.2f} ms, p99 {q[98] * 1000:.2f} ms, max {rtts[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake network client and load generator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--load', type=int, metavar='N', help="simulate N players instead of opening a window")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds to run the load generator")
+    parser.add_argument('--ping-interval', type=float, default=1.0, help="seconds between round-trip probes")
+    args = parser.parse_args()
+    if args.load:
+        asyncio.run(generate_load(args.host, args.port, args.load, args.duration, args.ping_interval))
+    else:
+        asyncio.run(play(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
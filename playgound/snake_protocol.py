@@ -0,0 +1,133 @@
+"""Wire format shared by snake_server.py and snake_client.py.
+
+Every server message is a frame: a 2-byte little-endian length followed by a
+type byte and a payload of varints (see snake_replay.write_varint). Cells are
+grid indices (y * width + x).
+
+    SNAPSHOT  sent once on start: tick, your player index, grid width and
+              height, food cell, player count, then per player its score,
+              length and cells head first
+    DELTA     sent every tick: tick, food cell + 1 (0 if the food did not
+              move), then per player its new head cell, a flags byte
+              (TAIL_KEPT when the snake grew instead of dropping its tail,
+              SCORE_CHANGED when a new score follows) and the score
+    GAME_OVER final scores, then the server closes the connection
+    PONG      echo of a client PING, for round-trip measurements
+
+Clients send single bytes: a direction code (UP, DOWN, LEFT, RIGHT) or PING.
+"""
+import struct
+from collections import deque
+
+from snake_replay import read_varint, write_varint
+
+SNAPSHOT = 1
+DELTA = 2
+GAME_OVER = 3
+PONG = 4
+
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+PING = 0xFF
+
+TAIL_KEPT = 1
+SCORE_CHANGED = 2
+
+FRAME_HEADER = struct.Struct('<H')
+
+
+def frame(message_type, payload=b''):
+    return FRAME_HEADER.pack(len(payload) + 1) + bytes((message_type,)) + payload
+
+
+def encode_snapshot(tick, you, width, height, food, snakes, scores):
+    # snakes is a list of head-first cell sequences
+    payload = bytearray()
+    for value in (tick, you, width, height, food, len(snakes)):
+        write_varint(payload, value)
+    for cells, score in zip(snakes, scores):
+        write_varint(payload, score)
+        write_varint(payload, len(cells))
+        for cell in cells:
+            write_varint(payload, cell)
+    return frame(SNAPSHOT, payload)
+
+
+def encode_delta(tick, food_moved_to, heads, tails_kept, scores_changed):
+    # scores_changed holds the new score per player, or None if unchanged
+    payload = bytearray()
+    write_varint(payload, tick)
+    write_varint(payload, 0 if food_moved_to is None else food_moved_to + 1)
+    for head, tail_kept, score in zip(heads, tails_kept, scores_changed):
+        write_varint(payload, head)
+        flags = (TAIL_KEPT if tail_kept else 0) | (SCORE_CHANGED if score is not None else 0)
+        payload.append(flags)
+        if score is not None:
+            write_varint(payload, score)
+    return frame(DELTA, payload)
+
+
+def encode_game_over(scores):
+    payload = bytearray()
+    write_varint(payload, len(scores))
+    for score in scores:
+        write_varint(payload, score)
+    return frame(GAME_OVER, payload)
+
+
+class ClientState:
+    # Client-side mirror of a session, rebuilt from a snapshot and kept current by deltas
+    def __init__(self):
+        self.tick = 0
+        self.you = None
+        self.width = self.height = 0
+        self.food = None
+        self.snakes = []
+        self.scores = []
+        self.game_over = False
+
+    def apply(self, message_type, payload):
+        if message_type == SNAPSHOT:
+            self.apply_snapshot(payload)
+        elif message_type == DELTA:
+            self.apply_delta(payload)
+        elif message_type == GAME_OVER:
+            count, offset = read_varint(payload, 0)
+            self.scores = []
+            for _ in range(count):
+                score, offset = read_varint(payload, offset)
+                self.scores.append(score)
+            self.game_over = True
+
+    def apply_snapshot(self, payload):
+        values = []
+        offset = 0
+        for _ in range(6):
+            value, offset = read_varint(payload, offset)
+            values.append(value)
+        self.tick, self.you, self.width, self.height, self.food, count = values
+        self.snakes = []
+        self.scores = []
+        for _ in range(count):
+            score, offset = read_varint(payload, offset)
+            length, offset = read_varint(payload, offset)
+            cells = deque()
+            for _ in range(length):
+                cell, offset = read_varint(payload, offset)
+                cells.append(cell)
+            self.snakes.append(cells)
+            self.scores.append(score)
+
+    def apply_delta(self, payload):
+        self.tick, offset = read_varint(payload, 0)
+        food, offset = read_varint(payload, offset)
+        if food:
+            self.food = food - 1
+        for index, cells in enumerate(self.snakes):
+            head, offset = read_varint(payload, offset)
+            flags = payload[offset]
+            offset += 1
+            cells.appendleft(head)
+            if not flags & TAIL_KEPT:
+                cells.pop()
+            if flags & SCORE_CHANGED:
+                self.scores[index], offset = read_varint(payload, offset)
@@ -0,0 +1,169 @@
+"""Compact, deterministic Snake replays.
+
+A replay is the game's random seed plus the direction changes each snake made,
+stored as a binary stream of (tick delta, player, direction) varints. Re-running
+snake.Game with the same seed and inputs reproduces the match exactly, so a
+replay costs a few bytes per turn instead of a video.
+
+Usage:
+    python snake_replay.py match.snkr                 # watch at normal speed
+    python snake_replay.py match.snkr --speed 4       # watch at 4x
+    python snake_replay.py *.snkr --headless          # re-simulate and verify
+"""
+import argparse
+import glob
+import struct
+import sys
+import time
+
+MAGIC = b'SNKR'
+VERSION = 1
+# magic, version, seed, player count, grid width, grid height, snake color, ticks
+HEADER = struct.Struct('<4sBQHHH3BI')
+SCORE = struct.Struct('<I')
+
+# Direction codes; snake.DIRECTIONS maps them to pygame keys
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class ReplayLog:
+    def __init__(self, seed, player_count, grid_width, grid_height, snake_color=(0, 255, 0)):
+        self.seed = seed
+        self.player_count = player_count
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.snake_color = tuple(snake_color)
+        self.ticks = 0
+        self.scores = []
+        self.events = bytearray()
+        self._last_tick = 0
+
+    def record(self, tick, player, direction):
+        # Events must be recorded in tick order
+        write_varint(self.events, tick - self._last_tick)
+        write_varint(self.events, player << 2 | direction)
+        self._last_tick = tick
+
+    def finish(self, ticks, scores):
+        self.ticks = ticks
+        self.scores = list(scores)
+
+    def iter_events(self):
+        tick = 0
+        offset = 0
+        while offset < len(self.events):
+            delta, offset = read_varint(self.events, offset)
+            code, offset = read_varint(self.events, offset)
+            tick += delta
+            yield tick, code >> 2, code & 3
+
+    def settings(self):
+        # Settings that rebuild the recorded game in snake.Game
+        return {
+            'snake_color': self.snake_color,
+            'player_count': self.player_count,
+            'grid_width': self.grid_width,
+            'grid_height': self.grid_height,
+            'seed': self.seed,
+        }
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.player_count, self.grid_width,
+                             self.grid_height, *self.snake_color, self.ticks)
+        scores = b''.join(SCORE.pack(score) for score in self.scores)
+        return header + scores + bytes(self.events)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, player_count, width, height, r, g, b, ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a Snake replay version {VERSION} (found magic {magic!r}, version {version})")
+        log = cls(seed, player_count, width, height, (r, g, b))
+        offset = HEADER.size
+        scores = [SCORE.unpack_from(data, offset + i * SCORE.size)[0] for i in range(player_count)]
+        log.finish(ticks, scores)
+        log.events = bytearray(data[offset + player_count * SCORE.size:])
+        return log
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+def play(log, speed=None):
+    """Re-simulate a replay and return the finished game.
+
+    With speed=None nothing is drawn and ticks run back to back; otherwise the
+    game is rendered at `speed` times the normal tick rate.
+    """
+    import pygame
+    import snake
+
+    game = snake.Game(log.settings())
+    clock = pygame.time.Clock()
+    events = log.iter_events()
+    pending = next(events, None)
+    for tick in range(log.ticks):
+        while pending is not None and pending[0] == tick:
+            _, player, direction = pending
+            game.players[player].snake.direction = snake.DIRECTIONS[direction]
+            pending = next(events, None)
+        game.update()
+        if speed is not None:
+            if any(event.type == pygame.QUIT for event in pygame.event.get()):
+                break
+            game.render()
+            clock.tick(snake.TICK_RATE * speed)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back or verify Snake replays")
+    parser.add_argument('paths', nargs='+', help="replay files or glob patterns")
+    parser.add_argument('--speed', type=float, default=1.0, help="playback speed-up when rendering")
+    parser.add_argument('--headless', action='store_true',
+                        help="re-simulate at full speed without rendering and check the final scores")
+    args = parser.parse_args()
+
+    paths = [path for pattern in args.paths for path in sorted(glob.glob(pattern)) or [pattern]]
+    start = time.perf_counter()
+    mismatches = 0
+    for path in paths:
+        log = ReplayLog.load(path)
+        game = play(log, None if args.headless else args.speed)
+        scores = [player.score for player in game.players]
+        if args.headless and scores != log.scores:
+            mismatches += 1
+            print(f"{path}: replayed scores {scores} != recorded {log.scores}")
+    if args.headless:
+        elapsed = time.perf_counter() - start
+        print(f"{len(paths)} replays in {elapsed:.2f}s ({len(paths) / elapsed:.0f}/s), {mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
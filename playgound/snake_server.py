@@ -0,0 +1,209 @@
+"""Authoritative asyncio server for local multiplayer Snake.
+
+Clients connect over TCP and are grouped into sessions of --players slots;
+a session starts as soon as it is full. One event loop runs every session's
+snake.Game at the tick rate and sends each client a snapshot on start and then
+one small delta per tick (see snake_protocol.py). A delta is a few bytes per
+snake, whatever its length. Clients that cannot keep up are dropped once their
+unsent output passes MAX_WRITE_BUFFER, so one slow reader cannot grow server
+memory or delay the others.
+
+Usage:
+    python snake_server.py --port 8765 --players 2
+    python snake_client.py --port 8765              # in two other terminals
+"""
+import argparse
+import asyncio
+import time
+
+import snake
+import snake_protocol as protocol
+
+MAX_WRITE_BUFFER = 64 * 1024
+STATS_INTERVAL = 5.0
+
+
+class Session:
+    def __init__(self, slots, bots, seed=None):
+        self.slots = slots
+        self.bots = bots
+        self.seed = seed
+        self.writers = []
+        self.game = None
+        self.finished = False
+
+    def is_full(self):
+        return len(self.writers) == self.slots and None not in self.writers
+
+    def add(self, writer):
+        # Reuse a slot given up before the session started
+        if None in self.writers:
+            index = self.writers.index(None)
+            self.writers[index] = writer
+            return index
+        self.writers.append(writer)
+        return len(self.writers) - 1
+
+    def leave(self, index):
+        # The snake of a player who left keeps going straight
+        self.writers[index] = None
+
+    def start(self):
+        # Remote players press direction keys, so each gets the identity key map
+        direction_keys = {direction: direction for direction in snake.DIRECTIONS}
+        self.game = snake.Game({'snake_color': (0, 255, 0), 'player_count': self.slots, 'bots': self.bots,
+                                'key_maps': [direction_keys] * self.slots, 'seed': self.seed})
+        self.last_food = self.food_cell()
+        self.last_scores = [player.score for player in self.game.players]
+        snakes = [[p.snake.cell_index(pos) for pos in p.snake.positions] for p in self.game.players]
+        for index, writer in enumerate(self.writers):
+            self.send(writer, protocol.encode_snapshot(
+                self.game.tick, index, self.game.grid_width, self.game.grid_height,
+                self.last_food, snakes, self.last_scores))
+
+    def food_cell(self):
+        return snake.cell_index(self.game.food.rect.topleft, self.game.grid_width)
+
+    def steer(self, index, direction):
+        if self.game is not None:
+            self.game.players[index].update_direction(snake.DIRECTIONS[direction])
+
+    def tick(self):
+        if all(writer is None for writer in self.writers):
+            # Everyone left; stop simulating
+            self.finished = True
+            return 0
+        game = self.game
+        game.update()
+        food = self.food_cell()
+        heads = []
+        tails_kept = []
+        scores = []
+        for idx, player in enumerate(game.players):
+            heads.append(player.snake.cell_index(player.snake.positions[0]))
+            tails_kept.append(player.snake.vacated is None)
+            scores.append(player.score if player.score != self.last_scores[idx] else None)
+            self.last_scores[idx] = player.score
+        data = protocol.encode_delta(game.tick, food if food != self.last_food else None,
+                                     heads, tails_kept, scores)
+        self.last_food = food
+        self.broadcast(data)
+
+        if game.game_over:
+            self.broadcast(protocol.encode_game_over(self.last_scores))
+            for writer in self.writers:
+                if writer is not None:
+                    writer.close()
+            self.finished = True
+        return len(data)
+
+    def broadcast(self, data):
+        for index, writer in enumerate(self.writers):
+            if writer is not None and not self.send(writer, data):
+                self.leave(index)
+
+    def send(self, writer, data):
+        if writer.is_closing():
+            return False
+        if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            writer.close()
+            return False
+        writer.write(data)
+        return True
+
+
+class SnakeServer:
+    def __init__(self, slots, bots, tick_rate):
+        self.slots = slots
+        self.bots = bots
+        self.tick_rate = tick_rate
+        self.sessions = []
+        self.waiting = None
+        self.bytes_sent = 0
+        self.slowest_tick = 0.0
+
+    def join(self, writer):
+        if self.waiting is None:
+            self.waiting = Session(self.slots, self.bots)
+        session = self.waiting
+        index = session.add(writer)
+        if session.is_full():
+            session.start()
+            self.sessions.append(session)
+            self.waiting = None
+        return session, index
+
+    async def handle_client(self, reader, writer):
+        session, index = self.join(writer)
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                for code in data:
+                    if code == protocol.PING:
+                        session.send(writer, protocol.frame(protocol.PONG))
+                    elif code <= protocol.RIGHT:
+                        session.steer(index, code)
+        except ConnectionError:
+            pass
+        finally:
+            if session.writers[index] is writer:
+                session.leave(index)
+            writer.close()
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        next_stats = next_tick + STATS_INTERVAL
+        while True:
+            start = time.perf_counter()
+            for session in self.sessions:
+                self.bytes_sent += session.tick()
+            self.sessions = [session for session in self.sessions if not session.finished]
+            self.slowest_tick = max(self.slowest_tick, time.perf_counter() - start)
+
+            now = loop.time()
+            if now >= next_stats:
+                self.print_stats()
+                next_stats = now + STATS_INTERVAL
+            next_tick += interval
+            if next_tick < now:
+                # Overran the tick budget; don't try to catch up in a burst
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+
+    def print_stats(self):
+        clients = sum(1 for session in self.sessions for writer in session.writers if writer is not None)
+        print(f"{len(self.sessions)} sessions, {clients} clients, "
+              f"{self.bytes_sent / STATS_INTERVAL / 1024:.1f} KiB/s of deltas, "
+              f"slowest tick {self.slowest_tick * 1000:.2f} ms", flush=True)
+        self.bytes_sent = 0
+        self.slowest_tick = 0.0
+
+
+async def serve(host, port, slots, bots, tick_rate):
+    server = SnakeServer(slots, bots, tick_rate)
+    listener = await asyncio.start_server(server.handle_client, host, port)
+    print(f"Snake server on {host}:{port}, {slots} players per session", flush=True)
+    async with listener:
+        await server.run_ticks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local multiplayer Snake server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--players', type=int, default=2, help="human players per session")
+    parser.add_argument('--bots', type=int, default=0, help="pathfinding bots added to each session")
+    parser.add_argument('--tick-rate', type=float, default=snake.TICK_RATE)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.players, args.bots, args.tick_rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
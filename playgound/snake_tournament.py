@@ -0,0 +1,129 @@
+"""Run bot-vs-bot Snake tournaments across all cores.
+
+Every pairing of the given bots plays two-player matches with the normal
+snake.Game rules on a process pool. Sides alternate between matches. Results
+stream back as batches finish and are aggregated into per-bot win rates and
+score distributions. A match is lost by the snake that crashes. If both crash,
+or the tick limit is reached, the higher score wins.
+
+Usage:
+    python snake_tournament.py --bots pathfinding greedy random --matches 10000
+    python snake_tournament.py --bots pathfinding greedy --results matches.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import snake
+from snake_bot import BOTS
+
+
+def play_match(bot_a, bot_b, seed, max_ticks):
+    game = snake.Game({'snake_color': (0, 255, 0), 'player_count': 0, 'bots': [bot_a, bot_b],
+                       'seed': seed})
+    while not game.game_over and game.tick < max_ticks:
+        game.update()
+    scores = [player.score for player in game.players]
+    if len(game.crashed) == 1:
+        winner = 1 if 1 in game.crashed else 0
+    elif scores[0] != scores[1]:
+        winner = 0 if scores[0] > scores[1] else 1
+    else:
+        winner = None
+    return {'bots': [bot_a, bot_b], 'seed': seed, 'ticks': game.tick, 'scores': scores,
+            'winner': None if winner is None else [bot_a, bot_b][winner]}
+
+
+def play_batch(matches, max_ticks):
+    # Runs in a worker process; batching keeps pickling overhead per match low
+    return [play_match(bot_a, bot_b, seed, max_ticks) for bot_a, bot_b, seed in matches]
+
+
+def schedule(bots, matches_per_pairing, seed):
+    for pair_index, (bot_a, bot_b) in enumerate(itertools.combinations(bots, 2)):
+        for i in range(matches_per_pairing):
+            match_seed = seed + pair_index * matches_per_pairing + i
+            yield (bot_a, bot_b, match_seed) if i % 2 == 0 else (bot_b, bot_a, match_seed)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+class Standings:
+    def __init__(self, bots):
+        self.wins = dict.fromkeys(bots, 0)
+        self.draws = dict.fromkeys(bots, 0)
+        self.played = dict.fromkeys(bots, 0)
+        self.scores = {bot: [] for bot in bots}
+        self.matches = 0
+
+    def add(self, result):
+        self.matches += 1
+        for bot, score in zip(result['bots'], result['scores']):
+            self.played[bot] += 1
+            self.scores[bot].append(score)
+            if result['winner'] is None:
+                self.draws[bot] += 1
+        if result['winner'] is not None:
+            self.wins[result['winner']] += 1
+
+    def report(self):
+        lines = [f"{'bot':<12} {'played':>8} {'win %':>7} {'draw %':>7} "
+                 f"{'mean':>8} {'p10':>6} {'p50':>6} {'p90':>6} {'max':>6}"]
+        for bot in sorted(self.wins, key=lambda b: -self.wins[b] / max(self.played[b], 1)):
+            played = self.played[bot]
+            if not played:
+                continue
+            scores = sorted(self.scores[bot])
+            deciles = statistics.quantiles(scores, n=10, method='inclusive') if len(scores) > 1 else scores * 9
+            lines.append(f"{bot:<12} {played:>8} {100 * self.wins[bot] / played:>6.1f}% "
+                         f"{100 * self.draws[bot] / played:>6.1f}% {statistics.fmean(scores):>8.1f} "
+                         f"{deciles[0]:>6.0f} {deciles[4]:>6.0f} {deciles[8]:>6.0f} {scores[-1]:>6}")
+        return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run bot-vs-bot Snake tournaments")
+    parser.add_argument('--bots', nargs='+', choices=sorted(BOTS), default=sorted(BOTS))
+    parser.add_argument('--matches', type=int, default=1000, help="matches per pairing of bots")
+    parser.add_argument('--max-ticks', type=int, default=5000, help="ticks before a match is called")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=50, help="matches per worker task")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--results', metavar='PATH', help="also write every match as JSON Lines")
+    args = parser.parse_args()
+    if len(set(args.bots)) < 2:
+        parser.error("need at least two different bots")
+
+    standings = Standings(args.bots)
+    results_file = open(args.results, 'w') if args.results else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(play_batch, batch, args.max_ticks)
+                       for batch in batched(schedule(args.bots, args.matches, args.seed), args.batch_size)]
+            for future in as_completed(futures):
+                for result in future.result():
+                    standings.add(result)
+                    if results_file:
+                        results_file.write(json.dumps(result) + '\n')
+                elapsed = time.perf_counter() - start
+                print(f"\r{standings.matches} matches, {standings.matches / elapsed:.0f}/s",
+                      end='', file=sys.stderr, flush=True)
+    finally:
+        if results_file:
+            results_file.close()
+    print(file=sys.stderr)
+    print(standings.report())
+
+
+if __name__ == "__main__":
+    main()